@@ -11,10 +11,16 @@ automatically check for architectural violations.
 import os
 import re
 import sys
-import json
 import argparse
-import subprocess
-from collections import defaultdict
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    # google-re2 matches in linear time without backtracking; optional
+    import re2 as _import_re
+except ImportError:
+    _import_re = re
 
 # Configuration
 ARCHITECTURE_PATTERNS = {
@@ -39,6 +45,9 @@ ARCHITECTURE_PATTERNS = {
     }
 }
 
+# Report order of violation severities
+SEVERITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
 # Module mapping to architectural components
 MODULE_MAPPING = {
     "src/ui/": {"pattern": "layered", "component": "ui"},
@@ -48,11 +57,111 @@ MODULE_MAPPING = {
     "src/events/": {"pattern": "event_driven", "component": "publisher"}
 }
 
+# Import extraction patterns, compiled once at import time (RE2 when available).
+# Each language uses a single alternation so the content is scanned only once;
+# the "from" branch also captures the imported name that follows it. Patterns
+# are bytes so file contents can be scanned without decoding them first.
+_PY_IMPORT_RE = _import_re.compile(
+    rb'from\s+(?P<module>[\w\.]+)\s+import(?:\s+(?P<name>[\w\.]+))?'
+    rb'|import\s+(?P<target>[\w\.]+)'
+)
+_JS_IMPORT_RE = _import_re.compile(
+    rb'import.*from\s+[\'"](?P<module>.+)[\'"]'
+    rb'|require\([\'"](?P<target>.+)[\'"]\)'
+)
+_JAVA_IMPORT_RE = _import_re.compile(rb'import\s+([\w\.]+);')
+_SERVICE_PATH_RE = re.compile(r'src/services/([^/]+)')
+
+# All MODULE_MAPPING paths as one alternation, so an import is scanned once
+_MODULE_PATH_RE = re.compile('|'.join(re.escape(module_path) for module_path in MODULE_MAPPING))
+
+# On-disk cache of import analysis results, keyed by path and validated by mtime/size.
+# It lives in the user cache directory so nothing is written into the analyzed repo.
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "sdlc-automation")
+# Bump when the cache layout changes; pattern changes invalidate the cache on their own
+IMPORT_CACHE_VERSION = 1
+
+_import_cache = None
+_import_cache_dirty = False
+_import_cache_seen = set()
+
+def _import_cache_file():
+    """Return the cache file for the current working directory."""
+    import hashlib
+    
+    # Cached paths are relative, so each working directory gets its own file
+    digest = hashlib.sha1(os.path.abspath(os.getcwd()).encode('utf-8', 'surrogateescape')).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"imports-{digest}.json")
+
+def _import_cache_key():
+    """Identify the cache format and the extraction patterns that produced it."""
+    import hashlib
+    
+    patterns = b'\0'.join(regex.pattern for regex in (_PY_IMPORT_RE, _JS_IMPORT_RE, _JAVA_IMPORT_RE))
+    return f"{IMPORT_CACHE_VERSION}:{hashlib.sha1(patterns).hexdigest()}"
+
+def load_import_cache():
+    """Load the import analysis cache from disk (once per process)."""
+    global _import_cache
+    if _import_cache is None:
+        import json
+        
+        try:
+            with open(_import_cache_file(), 'r') as f:
+                data = json.load(f)
+            # Results from another format or other patterns are discarded
+            if data.get("key") == _import_cache_key():
+                _import_cache = data["entries"]
+            else:
+                _import_cache = {}
+        except (OSError, ValueError, AttributeError, KeyError):
+            _import_cache = {}
+    return _import_cache
+
+def save_import_cache():
+    """Persist the import analysis cache, dropping files not analyzed in this run."""
+    global _import_cache, _import_cache_dirty
+    if _import_cache is None:
+        return
+    
+    # Entries for deleted, renamed or skipped files are pruned
+    if _import_cache.keys() - _import_cache_seen:
+        _import_cache = {path: entry for path, entry in _import_cache.items() if path in _import_cache_seen}
+        _import_cache_dirty = True
+    
+    if not _import_cache_dirty:
+        return
+    
+    import json
+    
+    try:
+        cache_file = _import_cache_file()
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, 'w') as f:
+            json.dump({"key": _import_cache_key(), "entries": _import_cache}, f)
+        _import_cache_dirty = False
+    except OSError as e:
+        print(f"Error saving import cache: {e}")
+
+def _decode_names(names):
+    """Decode captured import names, skipping groups that did not participate."""
+    return [name.decode('utf-8', 'replace') for name in names if name]
+
 def analyze_imports(file_path):
     """Analyze import statements in a file to detect dependencies."""
-    if not os.path.exists(file_path):
+    global _import_cache_dirty
+    try:
+        st = os.stat(file_path)
+    except OSError:
         return []
     
+    # Reuse the cached result if the file is unchanged since it was analyzed
+    cache = load_import_cache()
+    _import_cache_seen.add(file_path)
+    cached = cache.get(file_path)
+    if cached and cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+        return cached["imports"]
+    
     # Determine file type
     _, ext = os.path.splitext(file_path)
     ext = ext.lower()
@@ -60,36 +169,29 @@ def analyze_imports(file_path):
     imports = []
     
     try:
-        with open(file_path, 'r') as f:
+        with open(file_path, 'rb') as f:
             content = f.read()
         
         if ext == '.py':
             # Python imports
-            import_patterns = [
-                r'import\s+([\w\.]+)',
-                r'from\s+([\w\.]+)\s+import'
-            ]
-            
-            for pattern in import_patterns:
-                matches = re.findall(pattern, content)
-                imports.extend(matches)
+            for match in _PY_IMPORT_RE.finditer(content):
+                imports.extend(_decode_names(match.groups()))
         
         elif ext in ['.js', '.ts']:
             # JavaScript/TypeScript imports
-            import_patterns = [
-                r'import.*from\s+[\'"](.+)[\'"]',
-                r'require\([\'"](.+)[\'"]\)'
-            ]
-            
-            for pattern in import_patterns:
-                matches = re.findall(pattern, content)
-                imports.extend(matches)
+            for match in _JS_IMPORT_RE.finditer(content):
+                imports.extend(_decode_names(match.groups()))
         
         elif ext in ['.java']:
             # Java imports
-            import_pattern = r'import\s+([\w\.]+);'
-            matches = re.findall(import_pattern, content)
-            imports.extend(matches)
+            imports.extend(_decode_names(_JAVA_IMPORT_RE.findall(content)))
+        
+        cache[file_path] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "imports": imports
+        }
+        _import_cache_dirty = True
         
         return imports
     
@@ -97,181 +199,190 @@ def analyze_imports(file_path):
         print(f"Error analyzing imports in {file_path}: {e}")
         return []
 
+@functools.lru_cache(maxsize=None)
 def map_file_to_component(file_path):
     """Map a file to its architectural component based on its path."""
-    for module_path, mapping in MODULE_MAPPING.items():
-        if file_path.startswith(module_path):
-            return mapping
+    # MODULE_MAPPING keys are "<root>/<dir>/" prefixes, so one lookup on the
+    # file's first two path components replaces a scan over every prefix
+    parts = file_path.split('/', 2)
+    if len(parts) == 3:
+        return MODULE_MAPPING.get(f"{parts[0]}/{parts[1]}/")
     
     return None
 
-def check_layered_architecture(files_and_imports):
-    """Check adherence to layered architecture pattern."""
-    violations = []
+def map_import_to_component(import_path):
+    """Map an import to the architectural component of the module path it references."""
+    match = _MODULE_PATH_RE.search(import_path)
+    if match:
+        return MODULE_MAPPING[match.group(0)]
     
-    for file_path, imports in files_and_imports.items():
-        file_component = map_file_to_component(file_path)
-        
-        if not file_component or file_component["pattern"] != "layered":
-            continue
-        
-        layer = file_component["component"]
-        allowed = ARCHITECTURE_PATTERNS["layered"]["allowed_dependencies"].get(layer, [])
-        
-        for import_path in imports:
-            import_component = None
-            
-            # Map import to component
-            for module_path, mapping in MODULE_MAPPING.items():
-                if module_path in import_path:
-                    import_component = mapping
-                    break
-            
-            if import_component and import_component["pattern"] == "layered":
-                import_layer = import_component["component"]
-                
-                if import_layer not in allowed:
-                    violations.append({
-                        "file": file_path,
-                        "violation_type": "layered_architecture",
-                        "description": f"Layer '{layer}' should not depend on layer '{import_layer}'",
-                        "import": import_path,
-                        "severity": "high"
-                    })
-    
-    return violations
+    return None
 
-def check_microservice_boundaries(files_and_imports):
-    """Check adherence to microservice architecture boundaries."""
-    # Group files by service
-    services = defaultdict(list)
-    
-    for file_path in files_and_imports.keys():
-        # Extract service name from path (e.g., src/services/user-service/...)
-        match = re.search(r'src/services/([^/]+)', file_path)
-        if match:
-            service_name = match.group(1)
-            services[service_name].append(file_path)
-    
-    violations = []
+def _check_layered_file(file_path, imports, file_component, violations):
+    """Check one layered-architecture file's imports against its allowed dependencies."""
+    layer = file_component["component"]
+    allowed = ARCHITECTURE_PATTERNS["layered"]["allowed_dependencies"].get(layer, [])
     
-    # Check for cross-service dependencies
-    for file_path, imports in files_and_imports.items():
-        file_service = None
-        match = re.search(r'src/services/([^/]+)', file_path)
-        if match:
-            file_service = match.group(1)
+    for import_path in imports:
+        import_component = map_import_to_component(import_path)
         
-        if not file_service:
+        if import_component and import_component["pattern"] == "layered":
+            import_layer = import_component["component"]
+            
+            if import_layer not in allowed:
+                violations.append({
+                    "file": file_path,
+                    "violation_type": "layered_architecture",
+                    "description": f"Layer '{layer}' should not depend on layer '{import_layer}'",
+                    "import": import_path,
+                    "severity": "high"
+                })
+
+def _check_microservice_file(file_path, imports, file_service, violations):
+    """Check one service file's imports for cross-service dependencies."""
+    for import_path in imports:
+        # Resolve the target service directly from the import path
+        import_match = _SERVICE_PATH_RE.search(import_path)
+        if not import_match:
             continue
         
+        service_name = import_match.group(1)
+        if service_name != file_service:
+            violations.append({
+                "file": file_path,
+                "violation_type": "microservice_boundary",
+                "description": f"Service '{file_service}' should not directly import from service '{service_name}'",
+                "import": import_path,
+                "severity": "critical"
+            })
+
+def _check_event_driven_file(file_path, imports, file_component, violations):
+    """Check one event-driven file for direct publisher-to-subscriber imports."""
+    if file_component["component"] == "publisher":
+        # Publishers should not directly import subscribers
         for import_path in imports:
-            for service_name, service_files in services.items():
-                if service_name != file_service and any(service_path in import_path for service_path in service_files):
-                    violations.append({
-                        "file": file_path,
-                        "violation_type": "microservice_boundary",
-                        "description": f"Service '{file_service}' should not directly import from service '{service_name}'",
-                        "import": import_path,
-                        "severity": "critical"
-                    })
-    
-    return violations
+            if "subscriber" in import_path or "handler" in import_path:
+                violations.append({
+                    "file": file_path,
+                    "violation_type": "event_driven_pattern",
+                    "description": "Publishers should not directly import subscribers or handlers",
+                    "import": import_path,
+                    "severity": "medium"
+                })
 
-def check_event_driven_pattern(files_and_imports):
-    """Check adherence to event-driven architecture pattern."""
+def check_all_patterns(files_and_imports):
+    """Run every architectural check in a single pass over the files."""
     violations = []
     
-    # Check for direct calls between publishers and subscribers
     for file_path, imports in files_and_imports.items():
+        # Classify the file once and dispatch to the checks that apply to it
         file_component = map_file_to_component(file_path)
+        pattern = file_component["pattern"] if file_component else None
         
-        if not file_component or file_component["pattern"] != "event_driven":
-            continue
-        
-        component = file_component["component"]
+        if pattern == "layered":
+            _check_layered_file(file_path, imports, file_component, violations)
+        elif pattern == "event_driven":
+            _check_event_driven_file(file_path, imports, file_component, violations)
         
-        if component == "publisher":
-            # Publishers should not directly import subscribers
-            for import_path in imports:
-                if "subscriber" in import_path or "handler" in import_path:
-                    violations.append({
-                        "file": file_path,
-                        "violation_type": "event_driven_pattern",
-                        "description": "Publishers should not directly import subscribers or handlers",
-                        "import": import_path,
-                        "severity": "medium"
-                    })
+        match = _SERVICE_PATH_RE.search(file_path)
+        if match:
+            _check_microservice_file(file_path, imports, match.group(1), violations)
     
     return violations
 
 def analyze_files(files):
     """Analyze a list of files for architectural pattern adherence."""
-    files_and_imports = {}
+    # Load the cache up front so worker threads share a single instance
+    load_import_cache()
     
-    for file_path in files:
-        imports = analyze_imports(file_path)
-        files_and_imports[file_path] = imports
+    # File reads dominate and release the GIL, so threads overlap the I/O
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Dedupe each file's imports once (keeping first-seen order) before the checks
+        files_and_imports = {
+            file_path: tuple(dict.fromkeys(imports))
+            for file_path, imports in zip(files, executor.map(analyze_imports, files))
+        }
     
     # Run checks
-    violations = []
-    violations.extend(check_layered_architecture(files_and_imports))
-    violations.extend(check_microservice_boundaries(files_and_imports))
-    violations.extend(check_event_driven_pattern(files_and_imports))
+    violations = check_all_patterns(files_and_imports)
+    
+    save_import_cache()
     
     return violations
 
 def get_changed_files(base_ref, head_ref):
     """Get list of files changed between two refs."""
+    import subprocess
+    
+    # Only source code files are of interest; git filters them via pathspecs
+    code_extensions = ['.py', '.js', '.ts', '.java', '.c', '.cpp', '.go', '.rs']
+    
     try:
+        # Skip deleted files and use NUL-delimited output so paths with spaces survive
         result = subprocess.run(
-            ['git', 'diff', '--name-only', base_ref, head_ref],
+            ['git', 'diff', '--name-only', '-z', '--diff-filter=AMR', base_ref, head_ref, '--']
+            + [f'*{ext}' for ext in code_extensions],
             capture_output=True,
-            text=True,
             check=True
         )
         
-        files = [f.strip() for f in result.stdout.strip().split('\n') if f.strip()]
-        
-        # Filter to only include source code files
-        code_extensions = ['.py', '.js', '.ts', '.java', '.c', '.cpp', '.go', '.rs']
-        code_files = [f for f in files if any(f.endswith(ext) for ext in code_extensions)]
-        
-        return code_files
+        # Split the raw bytes once; surrogateescape keeps non-UTF-8 names intact
+        return [f.decode('utf-8', 'surrogateescape') for f in result.stdout.split(b'\0') if f]
     
     except subprocess.CalledProcessError as e:
         print(f"Error getting changed files: {e}")
         return []
 
-def generate_report(violations, output_format="text"):
-    """Generate a report of architectural violations."""
+def generate_report(violations, output_format="text", out_file=None):
+    """Generate a report of architectural violations.
+    
+    When out_file is given the report is written to it and None is returned;
+    JSON is then streamed with json.dump instead of being built as a string.
+    """
     if output_format == "json":
+        import json
+        
+        if out_file is not None:
+            json.dump(violations, out_file, indent=2)
+            return None
         return json.dumps(violations, indent=2)
     
     # Text format
     if not violations:
-        return "No architectural pattern violations found."
+        parts = ["No architectural pattern violations found."]
+    else:
+        parts = _format_text_violations(violations)
     
-    report = "Architectural Pattern Violations\n"
-    report += "===============================\n\n"
+    if out_file is not None:
+        out_file.writelines(parts)
+        return None
+    return "".join(parts)
+
+def _format_text_violations(violations):
+    """Format violations as text report fragments, grouped by severity."""
+    parts = [
+        "Architectural Pattern Violations\n",
+        "===============================\n\n"
+    ]
     
-    # Group by severity
-    by_severity = defaultdict(list)
-    for v in violations:
-        by_severity[v["severity"]].append(v)
+    # Group by severity with a single stable sort; unknown severities are not reported
+    ranked = sorted(
+        (v for v in violations if v["severity"] in SEVERITY_RANK),
+        key=lambda v: SEVERITY_RANK[v["severity"]]
+    )
     
-    for severity in ["critical", "high", "medium", "low"]:
-        if severity in by_severity:
-            report += f"{severity.upper()} Severity Violations:\n"
-            report += "-" * (len(severity) + 19) + "\n\n"
-            
-            for v in by_severity[severity]:
-                report += f"File: {v['file']}\n"
-                report += f"Violation: {v['description']}\n"
-                report += f"Import: {v['import']}\n"
-                report += "\n"
+    for severity, group in itertools.groupby(ranked, key=lambda v: v["severity"]):
+        parts.append(f"{severity.upper()} Severity Violations:\n")
+        parts.append("-" * (len(severity) + 19) + "\n\n")
+        
+        for v in group:
+            parts.append(f"File: {v['file']}\n")
+            parts.append(f"Violation: {v['description']}\n")
+            parts.append(f"Import: {v['import']}\n")
+            parts.append("\n")
     
-    return report
+    return parts
 
 def main():
     parser = argparse.ArgumentParser(description='Check architectural pattern adherence')
@@ -303,16 +414,13 @@ def main():
     # Analyze files
     violations = analyze_files(files)
     
-    # Generate report
-    report = generate_report(violations, args.output)
-    
-    # Output report
+    # Generate and output report
     if args.output_file:
         with open(args.output_file, 'w') as f:
-            f.write(report)
+            generate_report(violations, args.output, f)
         print(f"Report written to {args.output_file}")
     else:
-        print("\n" + report)
+        print("\n" + generate_report(violations, args.output))
     
     # Return non-zero exit code if violations found
     return 1 if violations else 0
@@ -10,8 +10,8 @@ linked Stories and Tasks based on templates.
 
 import os
 import re
-import json
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Configuration
@@ -22,6 +22,12 @@ OUTPUT_DIR = os.path.expanduser("~/project/work_items")
 os.makedirs(TEMPLATES_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Epic parsing patterns, compiled once at import time
+_EPIC_TITLE_RE = re.compile(r'# Epic: (.*)')
+_SCOPE_SUMMARY_RE = re.compile(r'## Scope Summary\s+(.*?)(?=\n##|\Z)', re.DOTALL)
+_BULLET_ITEM_RE = re.compile(r'[-*]\s+(.*?)(?=\n[-*]|\Z)', re.DOTALL)
+_NUMBERED_ITEM_RE = re.compile(r'\d+\.\s+(.*?)(?=\n\d+\.|\Z)', re.DOTALL)
+
 # Templates
 STORY_TEMPLATE = """# Story: {title}
 
@@ -79,27 +85,27 @@ def parse_epic(epic_file):
             content = f.read()
         
         # Extract Epic ID and title
-        title_match = re.search(r'# Epic: (.*)', content)
+        title_match = _EPIC_TITLE_RE.search(content)
         epic_id = os.path.basename(epic_file).replace('.md', '')
         epic_title = title_match.group(1).strip() if title_match else "Unknown Epic"
         
         # Extract scope items that will become Stories
-        scope_match = re.search(r'## Scope Summary\s+(.*?)(?=\n##|\Z)', content, re.DOTALL)
+        scope_match = _SCOPE_SUMMARY_RE.search(content)
         scope_text = scope_match.group(1).strip() if scope_match else ""
         
         # Extract potential story items from scope
         story_items = []
         if scope_text:
-            # Look for bullet points or numbered items
-            items = re.findall(r'[-*]\s+(.*?)(?=\n[-*]|\Z)', scope_text, re.DOTALL)
+            # Look for bullet points or numbered items, stripping as we go
+            items = [m.group(1).strip() for m in _BULLET_ITEM_RE.finditer(scope_text)]
             if not items:  # Try numbered list
-                items = re.findall(r'\d+\.\s+(.*?)(?=\n\d+\.|\Z)', scope_text, re.DOTALL)
+                items = [m.group(1).strip() for m in _NUMBERED_ITEM_RE.finditer(scope_text)]
             
             # If still no items, split by newlines
             if not items:
-                items = [line.strip() for line in scope_text.split('\n') if line.strip()]
+                items = [line.strip() for line in scope_text.split('\n')]
             
-            story_items = [item.strip() for item in items if item.strip()]
+            story_items = [item for item in items if item]
         
         return {
             "epic_id": epic_id,
@@ -197,6 +203,11 @@ def generate_tasks(stories):
     
     return tasks
 
+def write_work_item(file_path, content):
+    """Write a single work item file with a large write buffer."""
+    with open(file_path, 'w', buffering=1 << 16) as f:
+        f.write(content)
+
 def save_work_items(stories, tasks):
     """Save generated work items to files."""
     # Create directories for stories and tasks
@@ -205,21 +216,24 @@ def save_work_items(stories, tasks):
     os.makedirs(stories_dir, exist_ok=True)
     os.makedirs(tasks_dir, exist_ok=True)
     
-    # Save stories
+    # Save stories and tasks concurrently; file writes release the GIL
+    paths = [os.path.join(stories_dir, f"{s['id']}.md") for s in stories]
+    paths += [os.path.join(tasks_dir, f"{t['id']}.md") for t in tasks]
+    contents = [item['content'] for item in stories + tasks]
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        # Consume the results so any write error is raised here
+        list(executor.map(write_work_item, paths, contents))
+    
     for story in stories:
-        file_path = os.path.join(stories_dir, f"{story['id']}.md")
-        with open(file_path, 'w') as f:
-            f.write(story['content'])
         print(f"Created Story: {story['id']} - {story['title']}")
     
-    # Save tasks
     for task in tasks:
-        file_path = os.path.join(tasks_dir, f"{task['id']}.md")
-        with open(file_path, 'w') as f:
-            f.write(task['content'])
         print(f"Created Task: {task['id']} - {task['title']}")
     
     # Create a summary file
+    import json
+    
     summary = {
         "generated_at": datetime.now().isoformat(),
         "stories": [{"id": s["id"], "title": s["title"]} for s in stories],
@@ -9,7 +9,6 @@ and include references to Task/Story IDs. It can be used as a pre-commit hook or
 
 import re
 import sys
-import subprocess
 import argparse
 from enum import Enum
 
@@ -30,12 +29,18 @@ VALID_TYPES = [t.value for t in CommitType]
 WORK_ITEM_PATTERN = r'(#[A-Z]+-[A-Z0-9]+-[ST][0-9]+|#[A-Z]+-[0-9]+)'
 CONVENTIONAL_COMMIT_PATTERN = r'^({})(\([a-z0-9-]+\))?: .+'.format('|'.join(VALID_TYPES))
 
+# Patterns are compiled once at import time rather than on every validation
+_CONVENTIONAL_RE = re.compile(CONVENTIONAL_COMMIT_PATTERN, re.MULTILINE)
+_WORK_ITEM_RE = re.compile(WORK_ITEM_PATTERN, re.MULTILINE)
+
 def get_commit_message(commit_msg_file=None):
     """Get the commit message from file or from the last commit."""
     if commit_msg_file:
         with open(commit_msg_file, 'r') as f:
             return f.read().strip()
     else:
+        import subprocess
+
         try:
             result = subprocess.run(
                 ['git', 'log', '-1', '--pretty=%B'],
@@ -51,14 +56,14 @@ def get_commit_message(commit_msg_file=None):
 def validate_commit_format(message):
     """Validate that the commit message follows the Conventional Commits format."""
     # Check if the message follows the conventional commit format
-    if not re.match(CONVENTIONAL_COMMIT_PATTERN, message, re.MULTILINE):
+    if not _CONVENTIONAL_RE.match(message):
         return False, "Commit message does not follow Conventional Commits format"
     return True, None
 
 def validate_work_item_reference(message):
     """Validate that the commit message includes a reference to a work item."""
     # Check if the message contains a work item reference
-    if not re.search(WORK_ITEM_PATTERN, message, re.MULTILINE):
+    if not _WORK_ITEM_RE.search(message):
         return False, "Commit message does not include a work item reference"
     return True, None
 
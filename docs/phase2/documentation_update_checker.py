@@ -12,6 +12,7 @@ import os
 import re
 import sys
 import json
+import hashlib
 import argparse
 import subprocess
 from datetime import datetime
@@ -26,31 +27,103 @@ MODULE_DOC_MAPPING = {
     "src/utils/": ["docs/development/utilities.md"]
 }
 
+# Classification results keyed by the resolved base/head commit pair, kept in the
+# user cache directory so nothing is written into the checked-out repository
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "sdlc-automation")
+RESULT_CACHE_DIR = os.path.join(CACHE_DIR, "doc_update_checker")
+# Bump when the cached result layout or classification logic changes
+RESULT_CACHE_VERSION = 1
+
+# Every documentation prefix in MODULE_DOC_MAPPING, computed once at import time
+ALL_DOC_PREFIXES = tuple(sorted({doc for docs in MODULE_DOC_MAPPING.values() for doc in docs}))
+ALL_DOC_PREFIX_SET = frozenset(ALL_DOC_PREFIXES)
+DOC_PREFIX_LENGTHS = tuple(sorted({len(doc) for doc in ALL_DOC_PREFIXES}))
+
+# Cached results depend on the mapping, so editing it starts a fresh cache
+RESULT_CACHE_KEY = hashlib.sha1(
+    json.dumps([RESULT_CACHE_VERSION, MODULE_DOC_MAPPING], sort_keys=True).encode('utf-8')
+).hexdigest()[:16]
+
 def get_changed_files(base_ref, head_ref):
     """Get list of files changed between two refs."""
     try:
         result = subprocess.run(
-            ['git', 'diff', '--name-only', base_ref, head_ref],
+            ['git', 'diff', '--name-only', '-z', '--diff-filter=ACMR', base_ref, head_ref],
             capture_output=True,
-            text=True,
             check=True
         )
         
-        return [f.strip() for f in result.stdout.strip().split('\n') if f.strip()]
+        # Paths are NUL-delimited bytes; surrogateescape keeps non-UTF-8 names intact
+        return [f.decode('utf-8', 'surrogateescape') for f in result.stdout.split(b'\0') if f]
     
     except subprocess.CalledProcessError as e:
         print(f"Error getting changed files: {e}")
         return []
 
+def resolve_refs(base_ref, head_ref):
+    """Resolve both refs to commit SHAs with a single git call, or None on failure."""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', f"{base_ref}^{{commit}}", f"{head_ref}^{{commit}}"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    except subprocess.CalledProcessError:
+        return None
+    
+    shas = result.stdout.split()
+    return (shas[0], shas[1]) if len(shas) == 2 else None
+
+def result_cache_file(shas):
+    """Return the cache file for a (base, head) SHA pair under the current mapping."""
+    return os.path.join(RESULT_CACHE_DIR, f"{shas[0]}_{shas[1]}_{RESULT_CACHE_KEY}.json")
+
+def load_cached_result(shas):
+    """Load the classification cached for a (base, head) SHA pair, or None."""
+    cache_file = result_cache_file(shas)
+    try:
+        with open(cache_file, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_cached_result(shas, result):
+    """Cache a classification for a (base, head) SHA pair; SHAs are immutable and the mapping is in the key."""
+    cache_file = result_cache_file(shas)
+    try:
+        os.makedirs(RESULT_CACHE_DIR, exist_ok=True)
+        with open(cache_file, 'w') as f:
+            json.dump(result, f, separators=(',', ':'))
+    except OSError as e:
+        print(f"Error writing result cache: {e}")
+
+def get_module_for_file(file):
+    """Return the MODULE_DOC_MAPPING module containing a file, or None."""
+    # MODULE_DOC_MAPPING keys are "<root>/<dir>/" prefixes, so a single
+    # lookup on the file's first two path components finds its module
+    parts = file.split('/', 2)
+    if len(parts) == 3:
+        module = f"{parts[0]}/{parts[1]}/"
+        if module in MODULE_DOC_MAPPING:
+            return module
+    
+    return None
+
+def get_doc_prefixes_for_file(file, prefixes=ALL_DOC_PREFIX_SET, lengths=DOC_PREFIX_LENGTHS):
+    """Return every documentation prefix that a file path starts with."""
+    # Prefixes can nest (docs/api/ and docs/api/auth.md), so slice the path at
+    # each distinct prefix length and look the slice up in the prefix set
+    return [file[:n] for n in lengths if file[:n] in prefixes]
+
 def get_changed_modules(files):
     """Determine which modules have been changed based on file paths."""
     changed_modules = set()
     
     for file in files:
-        for module in MODULE_DOC_MAPPING.keys():
-            if file.startswith(module):
-                changed_modules.add(module)
-                break
+        module = get_module_for_file(file)
+        if module:
+            changed_modules.add(module)
     
     return list(changed_modules)
 
@@ -68,15 +141,39 @@ def get_affected_docs(modules):
 def check_doc_updates(files, affected_docs):
     """Check if any of the affected documentation files have been updated."""
     updated_docs = set()
+    prefixes = frozenset(affected_docs)
+    lengths = tuple(sorted({len(doc) for doc in prefixes}))
     
     for file in files:
-        for doc in affected_docs:
-            if file.startswith(doc) or (doc.endswith('/') and file.startswith(doc)):
-                updated_docs.add(doc)
-                break
+        updated_docs.update(get_doc_prefixes_for_file(file, prefixes, lengths))
     
     return list(updated_docs)
 
+def classify_changes(files):
+    """Classify changed files in a single pass.
+    
+    Returns (changed_modules, affected_docs, updated_docs) as lists in
+    first-seen order, equivalent to chaining get_changed_modules,
+    get_affected_docs and check_doc_updates.
+    """
+    changed_modules = {}
+    touched_docs = set()
+    
+    for file in files:
+        module = get_module_for_file(file)
+        if module:
+            changed_modules[module] = None
+        
+        # Record every documentation prefix this file falls under
+        touched_docs.update(get_doc_prefixes_for_file(file))
+    
+    affected_docs = list(dict.fromkeys(
+        doc for module in changed_modules for doc in MODULE_DOC_MAPPING[module]
+    ))
+    updated_docs = [doc for doc in affected_docs if doc in touched_docs]
+    
+    return list(changed_modules), affected_docs, updated_docs
+
 def generate_pr_comment(modules, affected_docs, updated_docs):
     """Generate a PR comment prompting for documentation updates."""
     if not affected_docs:
@@ -115,12 +212,19 @@ def write_output_for_github_action(output):
         os.makedirs('github_action_output', exist_ok=True)
         
         # Write output to file
-        with open('github_action_output/doc_update_comment.json', 'w') as f:
-            json.dump(output, f, indent=2)
+        with open('github_action_output/doc_update_comment.json', 'w', encoding='utf-8') as f:
+            json.dump(output, f, separators=(',', ':'))
         
-        # Print output for GitHub Actions
-        print(f"::set-output name=comment_type::{output['type']}")
-        print(f"::set-output name=comment_message::{output['message']}")
+        # Append step outputs to $GITHUB_OUTPUT; ::set-output is deprecated
+        github_output = os.environ.get('GITHUB_OUTPUT')
+        if github_output:
+            # The message spans multiple lines, so use a delimiter it cannot contain
+            delimiter = f"EOF_{os.urandom(8).hex()}"
+            with open(github_output, 'a', encoding='utf-8', buffering=1 << 16) as f:
+                f.write(
+                    f"comment_type={output['type']}\n"
+                    f"comment_message<<{delimiter}\n{output['message']}\n{delimiter}\n"
+                )
 
 def main():
     parser = argparse.ArgumentParser(description='Check for documentation updates needed')
@@ -128,18 +232,41 @@ def main():
     parser.add_argument('--head-ref', required=True, help='Head reference (e.g., feature-branch)')
     args = parser.parse_args()
     
-    # Get changed files
-    print(f"Getting files changed between {args.base_ref} and {args.head_ref}")
-    files = get_changed_files(args.base_ref, args.head_ref)
+    # Reuse the result of an earlier run against the same pair of commits
+    shas = resolve_refs(args.base_ref, args.head_ref)
+    cached = load_cached_result(shas) if shas else None
     
-    if not files:
-        print("No changed files found")
-        return 0
+    if cached:
+        print(f"Using cached result for {shas[0][:12]}..{shas[1][:12]}")
+        file_count = cached["file_count"]
+        changed_modules = cached["changed_modules"]
+        affected_docs = cached["affected_docs"]
+        updated_docs = cached["updated_docs"]
+    else:
+        # Get changed files
+        print(f"Getting files changed between {args.base_ref} and {args.head_ref}")
+        files = get_changed_files(args.base_ref, args.head_ref)
+        
+        if not files:
+            print("No changed files found")
+            return 0
+        
+        file_count = len(files)
+        
+        # Classify the changes in one pass
+        changed_modules, affected_docs, updated_docs = classify_changes(files)
+        
+        if shas:
+            save_cached_result(shas, {
+                "file_count": file_count,
+                "changed_modules": changed_modules,
+                "affected_docs": affected_docs,
+                "updated_docs": updated_docs
+            })
     
-    print(f"Found {len(files)} changed files")
+    print(f"Found {file_count} changed files")
     
     # Get changed modules
-    changed_modules = get_changed_modules(files)
     if not changed_modules:
         print("No modules with documentation requirements were changed")
         return 0
@@ -147,7 +274,6 @@ def main():
     print(f"Changed modules: {', '.join(changed_modules)}")
     
     # Get affected documentation
-    affected_docs = get_affected_docs(changed_modules)
     if not affected_docs:
         print("No documentation updates required")
         return 0
@@ -155,7 +281,6 @@ def main():
     print(f"Affected documentation: {', '.join(affected_docs)}")
     
     # Check if documentation has been updated
-    updated_docs = check_doc_updates(files, affected_docs)
     print(f"Updated documentation: {', '.join(updated_docs) if updated_docs else 'None'}")
     
     # Generate PR comment
@@ -10,51 +10,98 @@ relevant Task descriptions with links to the newly created files.
 import os
 import re
 import sys
+import io
 import json
 import argparse
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Configuration
 WORK_ITEMS_DIR = os.path.expanduser("~/project/work_items")
 TASKS_DIR = os.path.join(WORK_ITEMS_DIR, "tasks")
-LOG_FILE = os.path.expanduser("~/project/file_addition_log.json")
+LOG_FILE = os.path.expanduser("~/project/file_addition_log.jsonl")
+MAX_READ_WORKERS = 16
+
+# Number of space-separated fields before the path in each porcelain v2 status record type
+_STATUS_V2_PATH_FIELD = {b'1': 8, b'2': 9, b'u': 10}
+
+# Pattern for an existing "## Files Changed" section in a task description
+_FILES_CHANGED_RE = re.compile(r'## Files Changed\s+(.*?)(?=\n##|\Z)', re.DOTALL)
+
+# Link target of a "- [name](path) - ..." entry in the Files Changed section
+_FILE_LINK_RE = re.compile(r'\]\(([^)]+)\)')
+
+# Directory names that determine a file's category, in priority order
+DIR_CATEGORIES = {
+    "tests": "test",
+    "docs": "documentation",
+    "examples": "example"
+}
+
+# File extension to category, flattened into a single lookup table
+EXT_CATEGORIES = {
+    **dict.fromkeys(['.py', '.js', '.ts', '.java', '.c', '.cpp', '.go', '.rs'], 'implementation'),
+    **dict.fromkeys(['.md', '.txt', '.rst', '.adoc'], 'documentation'),
+    **dict.fromkeys(['.json', '.yaml', '.yml', '.toml', '.ini', '.cfg'], 'configuration'),
+    **dict.fromkeys(['.html', '.css', '.scss', '.less'], 'frontend'),
+    **dict.fromkeys(['.sql', '.db'], 'database')
+}
 
 def get_changed_files(since_commit=None):
     """Get list of files changed since the specified commit or in the working directory."""
     try:
+        # NUL-delimited (-z) output is never quoted and keeps unusual paths intact
         if since_commit:
             # Get files changed since the specified commit
             result = subprocess.run(
-                ['git', 'diff', '--name-status', since_commit],
+                ['git', 'diff', '--name-status', '-z', since_commit],
                 capture_output=True,
-                text=True,
                 check=True
             )
         else:
-            # Get files changed in the working directory
+            # Get files changed in the working directory, listing every untracked file
             result = subprocess.run(
-                ['git', 'status', '--porcelain'],
+                ['git', '--no-optional-locks', 'status', '--porcelain=v2', '-z',
+                 '--untracked-files=all', '--no-renames'],
                 capture_output=True,
-                text=True,
                 check=True
             )
         
         # Parse the output to get file paths and status
+        fields = result.stdout.split(b'\0')
         files = []
-        for line in result.stdout.strip().split('\n'):
-            if not line:
+        i = 0
+        while i < len(fields):
+            field = fields[i]
+            i += 1
+            if not field:
                 continue
             
             if since_commit:
-                # Format for git diff: A/M/D<tab>filepath
-                status, filepath = line.split('\t', 1)
-                files.append({'status': status, 'path': filepath})
+                # Format for git diff: status\0path\0, or status\0old\0new\0 for renames/copies
+                status = field.decode('ascii')
+                if status[0] in 'RC':
+                    i += 1
+                filepath = fields[i]
+                i += 1
             else:
-                # Format for git status: XY filepath
-                status = line[:2].strip()
-                filepath = line[3:].strip()
-                files.append({'status': status, 'path': filepath})
+                # Porcelain v2 records: "<type> <fields...> <path>"; '.' marks an unmodified side
+                entry_type = field[:1]
+                if entry_type == b'?':
+                    status = '??'
+                    filepath = field[2:]
+                elif entry_type in _STATUS_V2_PATH_FIELD:
+                    status = field[2:4].decode('ascii').replace('.', ' ').strip()
+                    filepath = field.split(b' ', _STATUS_V2_PATH_FIELD[entry_type])[-1]
+                    if entry_type == b'2':
+                        # Rename/copy records are followed by the original path
+                        i += 1
+                else:
+                    # Ignored files and header lines
+                    continue
+            
+            files.append({'status': status, 'path': filepath.decode('utf-8', 'surrogateescape')})
         
         return files
     
@@ -68,44 +115,44 @@ def categorize_file(filepath):
     _, ext = os.path.splitext(filepath)
     ext = ext.lower()
     
-    # Categorize based on directory
-    if '/tests/' in filepath or filepath.startswith('tests/'):
-        return 'test'
-    elif '/docs/' in filepath or filepath.startswith('docs/'):
-        return 'documentation'
-    elif '/examples/' in filepath or filepath.startswith('examples/'):
-        return 'example'
+    # Categorize based on directory (any path component before the file name)
+    directories = set(filepath.split('/')[:-1])
+    for directory, category in DIR_CATEGORIES.items():
+        if directory in directories:
+            return category
     
-    # Categorize based on extension
-    if ext in ['.py', '.js', '.ts', '.java', '.c', '.cpp', '.go', '.rs']:
-        return 'implementation'
-    elif ext in ['.md', '.txt', '.rst', '.adoc']:
-        return 'documentation'
-    elif ext in ['.json', '.yaml', '.yml', '.toml', '.ini', '.cfg']:
-        return 'configuration'
-    elif ext in ['.html', '.css', '.scss', '.less']:
-        return 'frontend'
-    elif ext in ['.sql', '.db']:
-        return 'database'
+    # Categorize based on extension, with 'other' as the default category
+    return EXT_CATEGORIES.get(ext, 'other')
+
+def load_task_contents(task_files):
+    """Read each task file once, returning a mapping of task file to lowercased content."""
+    if not task_files:
+        return {}
     
-    # Default category
-    return 'other'
+    def read_task(task_file):
+        with open(task_file, 'rb') as f:
+            return task_file, f.read().decode('utf-8', 'replace').lower()
+    
+    # Reads are I/O-bound, so overlap them; the worker cap bounds open file descriptors
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(task_files))) as executor:
+        return dict(executor.map(read_task, task_files))
 
 def find_related_task(filepath, task_files):
     """Find the most relevant task for a given file."""
+    return find_related_task_in_contents(filepath, load_task_contents(task_files))
+
+def find_related_task_in_contents(filepath, task_contents):
+    """Find the most relevant task for a given file among preloaded task contents."""
     # Extract components from filepath
     path_components = filepath.lower().split('/')
     filename = os.path.basename(filepath).lower()
     base_name, _ = os.path.splitext(filename)
+    category = categorize_file(filepath)
     
     best_match = None
     best_score = 0
     
-    for task_file in task_files:
-        # Read task content
-        with open(task_file, 'r') as f:
-            content = f.read().lower()
-        
+    for task_file, content in task_contents.items():
         # Calculate relevance score
         score = 0
         
@@ -123,7 +170,6 @@ def find_related_task(filepath, task_files):
                 score += 2
         
         # Check for file category match
-        category = categorize_file(filepath)
         if category in content:
             score += 3
         
@@ -138,80 +184,99 @@ def find_related_task(filepath, task_files):
     
     return None
 
-def update_task_description(task_file, filepath, category):
-    """Update a task description with a reference to the new file."""
+def add_files_to_task(task_file, file_entries):
+    """Add references to several files to a task description with a single rewrite.
+    
+    file_entries is a list of (filepath, category) tuples. Returns a dict
+    mapping each filepath to whether a reference was added.
+    """
+    results = {filepath: False for filepath, _ in file_entries}
+    
     try:
         with open(task_file, 'r') as f:
             content = f.read()
         
-        # Check if the file is already mentioned
-        if filepath in content:
-            print(f"File {filepath} already mentioned in {task_file}")
-            return False
+        # Collect the paths already listed in the Files Changed section
+        files_changed_match = _FILES_CHANGED_RE.search(content)
+        existing = set(_FILE_LINK_RE.findall(files_changed_match.group(1))) if files_changed_match else set()
+        
+        new_lines = []
+        for filepath, category in file_entries:
+            # Check if the file is already listed
+            if filepath in existing:
+                print(f"File {filepath} already mentioned in {task_file}")
+                continue
+            
+            existing.add(filepath)
+            new_lines.append(f"- [{os.path.basename(filepath)}]({filepath}) - {category.capitalize()} file")
+            results[filepath] = True
+        
+        if not new_lines:
+            return results
         
-        # Find the additional details section
+        new_entries = "\n".join(new_lines)
         additional_section = "*Additional details to be added during implementation:*"
-        if additional_section in content:
-            # Add a Files Changed section if it doesn't exist
-            if "## Files Changed" not in content:
-                # Insert before the first item in additional details
-                modified_content = content.replace(
-                    additional_section,
-                    f"{additional_section}\n\n## Files Changed\n- [{os.path.basename(filepath)}]({filepath}) - {category.capitalize()} file"
-                )
-            else:
-                # Find the Files Changed section
-                files_changed_match = re.search(r'## Files Changed\s+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-                if files_changed_match:
-                    files_section = files_changed_match.group(0)
-                    updated_files_section = f"{files_section}\n- [{os.path.basename(filepath)}]({filepath}) - {category.capitalize()} file"
-                    modified_content = content.replace(files_section, updated_files_section)
-                else:
-                    # Fallback: add at the end
-                    modified_content = f"{content}\n\n## Files Changed\n- [{os.path.basename(filepath)}]({filepath}) - {category.capitalize()} file"
+        
+        # Splice the new entries in with one pass over the content
+        buf = io.StringIO()
+        if files_changed_match:
+            # Append to the existing Files Changed section
+            insert_at = files_changed_match.end()
+            buf.write(content[:insert_at])
+            buf.write(f"\n{new_entries}")
+            buf.write(content[insert_at:])
+        elif additional_section in content:
+            # Insert a Files Changed section before the first item in additional details
+            insert_at = content.index(additional_section) + len(additional_section)
+            buf.write(content[:insert_at])
+            buf.write(f"\n\n## Files Changed\n{new_entries}")
+            buf.write(content[insert_at:])
         else:
             # Fallback: add at the end
-            modified_content = f"{content}\n\n## Files Changed\n- [{os.path.basename(filepath)}]({filepath}) - {category.capitalize()} file"
+            buf.write(content)
+            buf.write(f"\n\n## Files Changed\n{new_entries}")
         
         # Write the updated content
         with open(task_file, 'w') as f:
-            f.write(modified_content)
+            f.write(buf.getvalue())
         
-        print(f"Updated {task_file} with reference to {filepath}")
-        return True
+        for filepath, added in results.items():
+            if added:
+                print(f"Updated {task_file} with reference to {filepath}")
+        
+        return results
     
     except Exception as e:
         print(f"Error updating task description: {e}")
-        return False
+        return {filepath: False for filepath in results}
 
-def log_file_addition(task_file, filepath, category, success):
-    """Log the file addition operation."""
+def update_task_description(task_file, filepath, category):
+    """Update a task description with a reference to the new file."""
+    return add_files_to_task(task_file, [(filepath, category)])[filepath]
+
+def build_log_entry(task_file, filepath, category, success):
+    """Build a log record for a file addition operation."""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "task_file": task_file,
+        "filepath": filepath,
+        "category": category,
+        "success": success
+    }
+
+def write_log_entries(log_entries):
+    """Append log records to the JSON-lines log, one object per line."""
     try:
-        # Create or load the log file
-        if os.path.exists(LOG_FILE):
-            with open(LOG_FILE, 'r') as f:
-                log_data = json.load(f)
-        else:
-            log_data = {"file_additions": []}
-        
-        # Add the new entry
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "task_file": task_file,
-            "filepath": filepath,
-            "category": category,
-            "success": success
-        }
-        
-        log_data["file_additions"].append(log_entry)
-        
-        # Write the updated log
-        with open(LOG_FILE, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        with open(LOG_FILE, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(entry, separators=(',', ':')) + '\n' for entry in log_entries)
     
     except Exception as e:
         print(f"Error logging file addition: {e}")
 
+def log_file_addition(task_file, filepath, category, success):
+    """Log the file addition operation."""
+    write_log_entries([build_log_entry(task_file, filepath, category, success)])
+
 def process_changed_files(files):
     """Process a list of changed files and update related tasks."""
     # Ensure tasks directory exists
@@ -220,12 +285,18 @@ def process_changed_files(files):
         return
     
     # Get all task files
-    task_files = [os.path.join(TASKS_DIR, f) for f in os.listdir(TASKS_DIR) if f.endswith('.md')]
+    with os.scandir(TASKS_DIR) as entries:
+        task_files = [e.path for e in entries if e.name.endswith('.md') and e.is_file()]
     if not task_files:
         print("No task files found")
         return
     
-    # Process each changed file
+    # Read every task once up front rather than once per changed file
+    task_contents = load_task_contents(task_files)
+    
+    # Match each changed file to a task, grouping the files per task
+    task_to_new_files = {}
+    log_entries = []
     for file_info in files:
         filepath = file_info['path']
         status = file_info['status']
@@ -236,17 +307,25 @@ def process_changed_files(files):
             category = categorize_file(filepath)
             
             # Find related task
-            related_task = find_related_task(filepath, task_files)
+            related_task = find_related_task_in_contents(filepath, task_contents)
             
             if related_task:
-                # Update the task description
-                success = update_task_description(related_task, filepath, category)
-                
-                # Log the operation
-                log_file_addition(related_task, filepath, category, success)
+                task_to_new_files.setdefault(related_task, []).append((filepath, category))
             else:
                 print(f"No related task found for {filepath}")
-                log_file_addition(None, filepath, category, False)
+                log_entries.append(build_log_entry(None, filepath, category, False))
+    
+    # Update each task description with a single read and write
+    for task_file, file_entries in task_to_new_files.items():
+        results = add_files_to_task(task_file, file_entries)
+        
+        # Log the operations
+        for filepath, category in file_entries:
+            log_entries.append(build_log_entry(task_file, filepath, category, results[filepath]))
+    
+    # Append the whole run to the log with a single open
+    if log_entries:
+        write_log_entries(log_entries)
 
 def main():
     parser = argparse.ArgumentParser(description='Update task descriptions with new files')
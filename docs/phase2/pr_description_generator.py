@@ -13,7 +13,9 @@ import re
 import sys
 import json
 import argparse
+import functools
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Configuration
@@ -21,6 +23,28 @@ WORK_ITEMS_DIR = os.path.expanduser("~/project/work_items")
 STORIES_DIR = os.path.join(WORK_ITEMS_DIR, "stories")
 TASKS_DIR = os.path.join(WORK_ITEMS_DIR, "tasks")
 PR_TEMPLATE_FILE = os.path.expanduser("~/project/templates/pr_template.md")
+MAX_READ_WORKERS = 16
+
+# File extension to change category, flattened into a single lookup table
+CHANGE_CATEGORIES = {
+    **dict.fromkeys(['.py', '.js', '.ts', '.java', '.c', '.cpp', '.go', '.rs'], "Code"),
+    **dict.fromkeys(['.md', '.txt', '.rst', '.adoc'], "Documentation"),
+    **dict.fromkeys(['.json', '.yaml', '.yml', '.toml', '.ini', '.cfg'], "Configuration")
+}
+
+# Work item ID patterns; the longer Story/Task form is tried first so that
+# e.g. PROJ-EPIC-S1 is not cut short at PROJ-EPIC
+_BRANCH_ID_RE = re.compile(r'(?:feature|bugfix|fix|hotfix|release)/([A-Z]+-(?:[A-Z0-9]+-[ST]\d+|\d+))')
+_COMMIT_ID_RE = re.compile(r'#([A-Z]+-(?:[A-Z0-9]+-[ST]\d+|\d+))')
+_STORY_ID_RE = re.compile(r'[A-Z]+-[A-Z0-9]+-S\d+')
+_TASK_ID_RE = re.compile(r'[A-Z]+-[A-Z0-9]+-T\d+')
+_GENERIC_ID_RE = re.compile(r'[A-Z]+-\d+')
+
+# Work item patterns, compiled once at import time. _SECTION_RE splits a
+# document into its "## Heading" sections in a single pass.
+_TITLE_RE = re.compile(r'# (?:Story|Task): (.*)')
+_SECTION_RE = re.compile(r'^## ([^\n]+)\n(.*?)(?=\n##|\Z)', re.MULTILINE | re.DOTALL)
+_AC_ITEM_SPLIT_RE = re.compile(r'^- ', re.MULTILINE)
 
 # Default PR template if template file doesn't exist
 DEFAULT_PR_TEMPLATE = """# Pull Request: {title}
@@ -63,13 +87,8 @@ def get_current_branch():
 
 def extract_work_item_ids_from_branch(branch_name):
     """Extract work item IDs from branch name using common patterns."""
-    # Look for patterns like feature/PROJ-123, bugfix/PROJ-456, etc.
-    match = re.search(r'(?:feature|bugfix|fix|hotfix|release)/([A-Z]+-\d+)', branch_name)
-    if match:
-        return [match.group(1)]
-    
-    # Look for patterns like feature/PROJ-EPIC-S1, etc.
-    match = re.search(r'(?:feature|bugfix|fix|hotfix|release)/([A-Z]+-[A-Z0-9]+-[ST]\d+)', branch_name)
+    # Look for patterns like feature/PROJ-123 or feature/PROJ-EPIC-S1 in one scan
+    match = _BRANCH_ID_RE.search(branch_name)
     if match:
         return [match.group(1)]
     
@@ -88,52 +107,75 @@ def extract_work_item_ids_from_commits():
         content = result.stdout.strip()
         
         # Look for work item references like #PROJ-123 or #PROJ-EPIC-S1
-        matches = re.findall(r'#([A-Z]+-\d+|[A-Z]+-[A-Z0-9]+-[ST]\d+)', content)
+        matches = _COMMIT_ID_RE.findall(content)
         
-        return list(set(matches))  # Remove duplicates
+        return list(dict.fromkeys(matches))  # Remove duplicates, keeping first-seen order
     
     except subprocess.CalledProcessError as e:
         print(f"Error extracting work item IDs from commits: {e}")
         return []
 
+def list_work_item_ids(directory):
+    """Return the IDs of the work item markdown files in a directory."""
+    try:
+        with os.scandir(directory) as entries:
+            return {e.name[:-3] for e in entries if e.name.endswith('.md')}
+    except FileNotFoundError:
+        return set()
+
 def find_work_item_files(work_item_ids):
     """Find work item files based on IDs."""
     work_item_files = []
     
+    # Scan each directory once instead of checking every candidate path
+    story_ids = list_work_item_ids(STORIES_DIR)
+    task_ids = list_work_item_ids(TASKS_DIR)
+    
     for work_id in work_item_ids:
         # Determine if it's a Story or Task based on ID format
-        if re.match(r'[A-Z]+-[A-Z0-9]+-S\d+', work_id):
+        if _STORY_ID_RE.match(work_id):
             # It's a Story
-            file_path = os.path.join(STORIES_DIR, f"{work_id}.md")
-            if os.path.exists(file_path):
-                work_item_files.append({"id": work_id, "type": "Story", "path": file_path})
-        elif re.match(r'[A-Z]+-[A-Z0-9]+-T\d+', work_id):
+            if work_id in story_ids:
+                work_item_files.append({"id": work_id, "type": "Story", "path": os.path.join(STORIES_DIR, f"{work_id}.md")})
+        elif _TASK_ID_RE.match(work_id):
             # It's a Task
-            file_path = os.path.join(TASKS_DIR, f"{work_id}.md")
-            if os.path.exists(file_path):
-                work_item_files.append({"id": work_id, "type": "Task", "path": file_path})
-        elif re.match(r'[A-Z]+-\d+', work_id):
+            if work_id in task_ids:
+                work_item_files.append({"id": work_id, "type": "Task", "path": os.path.join(TASKS_DIR, f"{work_id}.md")})
+        elif _GENERIC_ID_RE.match(work_id):
             # It could be an Epic or other work item
             # Check in both directories
-            story_path = os.path.join(STORIES_DIR, f"{work_id}.md")
-            task_path = os.path.join(TASKS_DIR, f"{work_id}.md")
-            
-            if os.path.exists(story_path):
-                work_item_files.append({"id": work_id, "type": "Story", "path": story_path})
-            elif os.path.exists(task_path):
-                work_item_files.append({"id": work_id, "type": "Task", "path": task_path})
+            if work_id in story_ids:
+                work_item_files.append({"id": work_id, "type": "Story", "path": os.path.join(STORIES_DIR, f"{work_id}.md")})
+            elif work_id in task_ids:
+                work_item_files.append({"id": work_id, "type": "Task", "path": os.path.join(TASKS_DIR, f"{work_id}.md")})
     
     return work_item_files
 
 def extract_work_item_details(work_item):
     """Extract relevant details from a work item file."""
     try:
-        with open(work_item["path"], 'r') as f:
+        mtime_ns = os.stat(work_item["path"]).st_mtime_ns
+    except OSError as e:
+        print(f"Error extracting details from {work_item['path']}: {e}")
+        return None
+    
+    details = _extract_work_item_details(work_item["path"], mtime_ns, work_item["type"], work_item["id"])
+    if details is None:
+        return None
+    
+    # The cached dict is shared between calls, so hand out a copy
+    return dict(details, acceptance_criteria=list(details["acceptance_criteria"]))
+
+@functools.lru_cache(maxsize=4096)
+def _extract_work_item_details(path, mtime_ns, item_type, item_id):
+    """Parse a work item file; cached on the file's mtime so unchanged files are read once."""
+    try:
+        with open(path, 'r') as f:
             content = f.read()
         
         details = {
-            "id": work_item["id"],
-            "type": work_item["type"],
+            "id": item_id,
+            "type": item_type,
             "title": "",
             "description": "",
             "acceptance_criteria": [],
@@ -141,28 +183,28 @@ def extract_work_item_details(work_item):
         }
         
         # Extract title
-        title_match = re.search(r'# (?:Story|Task): (.*)', content)
+        title_match = _TITLE_RE.search(content)
         if title_match:
             details["title"] = title_match.group(1).strip()
         
+        # Split into sections once; the first occurrence of a heading wins
+        sections = {}
+        for match in _SECTION_RE.finditer(content):
+            sections.setdefault(match.group(1).strip(), match.group(2).strip())
+        
         # Extract description (for Tasks)
-        if work_item["type"] == "Task":
-            desc_match = re.search(r'## Description\s+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-            if desc_match:
-                details["description"] = desc_match.group(1).strip()
+        if item_type == "Task":
+            details["description"] = sections.get("Description", "")
         
         # Extract user value (for Stories)
-        if work_item["type"] == "Story":
-            value_match = re.search(r'## User Value\s+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-            if value_match:
-                details["user_value"] = value_match.group(1).strip()
+        if item_type == "Story":
+            details["user_value"] = sections.get("User Value", "")
         
         # Extract acceptance criteria
-        ac_match = re.search(r'## Acceptance Criteria\s+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        if ac_match:
-            criteria_text = ac_match.group(1).strip()
-            # Split by bullet points
-            criteria = re.findall(r'- (.*?)(?=\n-|\Z)', criteria_text, re.DOTALL)
+        criteria_text = sections.get("Acceptance Criteria")
+        if criteria_text is not None:
+            # Split by bullet points; text before the first bullet is not a criterion
+            criteria = _AC_ITEM_SPLIT_RE.split(criteria_text)[1:]
             if criteria:
                 details["acceptance_criteria"] = [c.strip() for c in criteria]
             else:
@@ -171,20 +213,25 @@ def extract_work_item_details(work_item):
         return details
     
     except Exception as e:
-        print(f"Error extracting details from {work_item['path']}: {e}")
+        print(f"Error extracting details from {path}: {e}")
         return None
 
-def get_changed_files():
+def get_changed_files(include_untracked=False):
     """Get list of files changed in the current branch compared to main."""
     try:
-        result = subprocess.run(
-            ['git', 'diff', '--name-only', 'origin/main...HEAD'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        # Deleted files are left out; only added, copied, modified and renamed paths matter
+        commands = [['git', 'diff', '--name-only', '-z', '--diff-filter=ACMR', 'origin/main...HEAD']]
+        if include_untracked:
+            commands.append(['git', 'ls-files', '--others', '--exclude-standard', '-z'])
+        
+        files = []
+        for command in commands:
+            result = subprocess.run(command, capture_output=True, check=True)
+            
+            # Paths are NUL-delimited bytes; surrogateescape keeps non-UTF-8 names intact
+            files.extend(f.decode('utf-8', 'surrogateescape') for f in result.stdout.split(b'\0') if f)
         
-        return [f.strip() for f in result.stdout.strip().split('\n') if f.strip()]
+        return files
     
     except subprocess.CalledProcessError as e:
         print(f"Error getting changed files: {e}")
@@ -201,17 +248,14 @@ def categorize_changes(files):
     }
     
     for file in files:
-        if file.endswith(('.py', '.js', '.ts', '.java', '.c', '.cpp', '.go', '.rs')):
-            if '/tests/' in file or file.startswith('tests/') or '_test.' in file or file.endswith('_test.py'):
-                categories["Tests"].append(file)
-            else:
-                categories["Code"].append(file)
-        elif file.endswith(('.md', '.txt', '.rst', '.adoc')):
-            categories["Documentation"].append(file)
-        elif file.endswith(('.json', '.yaml', '.yml', '.toml', '.ini', '.cfg')):
-            categories["Configuration"].append(file)
-        else:
-            categories["Other"].append(file)
+        _, ext = os.path.splitext(file)
+        category = CHANGE_CATEGORIES.get(ext, "Other")
+        
+        # Code under a tests directory or named *_test.* counts as tests
+        if category == "Code" and ('/tests/' in file or file.startswith('tests/') or '_test.' in file):
+            category = "Tests"
+        
+        categories[category].append(file)
     
     return categories
 
@@ -230,48 +274,49 @@ def generate_pr_description(work_items, changed_files):
         title = "Multiple changes"
     
     # Generate description
-    description = ""
+    description_parts = []
     for item in work_items:
         if item["type"] == "Story":
-            description += f"Implements Story {item['id']}: {item['title']}\n\n"
+            description_parts.append(f"Implements Story {item['id']}: {item['title']}\n\n")
             if item["user_value"]:
-                description += f"{item['user_value']}\n\n"
+                description_parts.append(f"{item['user_value']}\n\n")
         else:
-            description += f"Addresses Task {item['id']}: {item['title']}\n\n"
+            description_parts.append(f"Addresses Task {item['id']}: {item['title']}\n\n")
             if item["description"]:
-                description += f"{item['description']}\n\n"
+                description_parts.append(f"{item['description']}\n\n")
+    description = "".join(description_parts)
     
     # Generate work items section
-    work_items_section = ""
-    for item in work_items:
-        work_items_section += f"- {item['type']} [{item['id']}](link-to-work-item): {item['title']}\n"
+    work_items_section = "".join(
+        f"- {item['type']} [{item['id']}](link-to-work-item): {item['title']}\n"
+        for item in work_items
+    )
     
     # Generate changes section
     categorized_changes = categorize_changes(changed_files)
-    changes_section = ""
-    
-    for category, files in categorized_changes.items():
-        if files:
-            changes_section += f"### {category}\n"
-            for file in files:
-                changes_section += f"- {file}\n"
-            changes_section += "\n"
+    changes_section = "".join(
+        f"### {category}\n" + "".join(f"- {file}\n" for file in files) + "\n"
+        for category, files in categorized_changes.items()
+        if files
+    )
     
     # Generate testing section
-    testing_section = "Please describe the tests that you ran to verify your changes."
+    testing_parts = ["Please describe the tests that you ran to verify your changes."]
     if work_items:
-        testing_section += "\n\nAcceptance Criteria:\n"
-        for item in work_items:
-            if item["acceptance_criteria"]:
-                for criterion in item["acceptance_criteria"]:
-                    testing_section += f"- [ ] {criterion}\n"
+        testing_parts.append("\n\nAcceptance Criteria:\n")
+        testing_parts.extend(
+            f"- [ ] {criterion}\n"
+            for item in work_items
+            for criterion in item["acceptance_criteria"]
+        )
+    testing_section = "".join(testing_parts)
     
     # Generate documentation section
-    documentation_section = "Please describe any documentation changes required."
+    documentation_parts = ["Please describe any documentation changes required."]
     if categorized_changes["Documentation"]:
-        documentation_section += "\n\nUpdated documentation:\n"
-        for doc in categorized_changes["Documentation"]:
-            documentation_section += f"- {doc}\n"
+        documentation_parts.append("\n\nUpdated documentation:\n")
+        documentation_parts.extend(f"- {doc}\n" for doc in categorized_changes["Documentation"])
+    documentation_section = "".join(documentation_parts)
     
     # Fill in template
     pr_description = template.format(
@@ -289,10 +334,17 @@ def main():
     parser = argparse.ArgumentParser(description='Generate PR description from work items')
     parser.add_argument('--output', help='Output file (defaults to stdout)')
     parser.add_argument('--work-item', action='append', help='Specific work item ID to include')
+    parser.add_argument('--include-untracked', action='store_true', help='Also list untracked files as changes')
     args = parser.parse_args()
     
+    # The three git queries are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        branch_future = executor.submit(get_current_branch)
+        commit_ids_future = executor.submit(extract_work_item_ids_from_commits)
+        changed_files_future = executor.submit(get_changed_files, args.include_untracked)
+    
     # Get current branch
-    branch = get_current_branch()
+    branch = branch_future.result()
     if not branch:
         print("Error: Could not determine current branch")
         return 1
@@ -311,7 +363,7 @@ def main():
     work_item_ids.extend(branch_ids)
     
     # From commit messages
-    commit_ids = extract_work_item_ids_from_commits()
+    commit_ids = commit_ids_future.result()
     work_item_ids.extend(commit_ids)
     
     # Remove duplicates
@@ -332,18 +384,16 @@ def main():
     print(f"Found {len(work_item_files)} work item files")
     
     # Extract work item details
-    work_items = []
-    for item in work_item_files:
-        details = extract_work_item_details(item)
-        if details:
-            work_items.append(details)
+    # Files are read concurrently; map keeps the work item order
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(work_item_files))) as executor:
+        work_items = [details for details in executor.map(extract_work_item_details, work_item_files) if details]
     
     if not work_items:
         print("Error: Could not extract details from work items")
         return 1
     
     # Get changed files
-    changed_files = get_changed_files()
+    changed_files = changed_files_future.result()
     
     if not changed_files:
         print("Warning: No changed files found")
@@ -9,14 +9,40 @@ It integrates with Cursor rules to provide comprehensive automated checks and fe
 
 import os
 import re
+import ast
 import sys
 import json
+import bisect
+import warnings
+import itertools
 import argparse
 import subprocess
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    # google-re2 matches in linear time without backtracking; optional
+    import re2
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.log_errors = False
+except ImportError:
+    re2 = None
 
 # Configuration
 CURSOR_RULES_DIR = os.path.expanduser("~/.cursor/rules")
+# Parsed rules are cached in the user cache directory, not the reviewed repository
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "sdlc-automation")
+RULES_CACHE_FILE = os.path.join(CACHE_DIR, "cursor_rules.json")
+
+# Changed files that are skipped instead of reviewed
+MAX_FILE_SIZE = 1024 * 1024
+BINARY_SNIFF_BYTES = 8000
+VENDORED_DIRS = {"vendor", "node_modules", "third_party"}
+
+# Limits on pattern scans so generated or minified files cannot flood the report
+MAX_MATCHES_PER_PATTERN = 50
+# Same bound as the read cap, for content passed straight to the check functions
+MAX_SCAN_CHARS = MAX_FILE_SIZE
 CODE_QUALITY_CHECKS = {
     "naming_conventions": {
         "description": "Check for adherence to naming conventions",
@@ -25,7 +51,8 @@ CODE_QUALITY_CHECKS = {
                 "class": r"class\s+([A-Za-z0-9_]+)",
                 "function": r"def\s+([a-z0-9_]+)",
                 "constant": r"([A-Z0-9_]{2,})\s*=",
-                "variable": r"([a-z0-9_]+)\s*="
+                # The lookbehind only skips starts inside an identifier, which can never match first
+                "variable": r"(?<![a-z0-9_])([a-z0-9_]+)\s*="
             },
             "javascript": {
                 "class": r"class\s+([A-Za-z0-9_]+)",
@@ -71,67 +98,182 @@ CODE_QUALITY_CHECKS = {
     }
 }
 
+def _compile_scan_pattern(pattern):
+    """Compile a pattern that scans whole file contents, using RE2 when it supports the syntax."""
+    if re2 is not None:
+        try:
+            return re2.compile(pattern, _RE2_OPTIONS)
+        except re2.error:
+            # Lookarounds and backreferences are not supported by RE2
+            pass
+    return re.compile(pattern)
+
+# Compiled forms of the CODE_QUALITY_CHECKS patterns, built once at import time
+_NAMING_PATTERNS = {
+    file_type: {element_type: _compile_scan_pattern(pattern) for element_type, pattern in patterns.items()}
+    for file_type, patterns in CODE_QUALITY_CHECKS["naming_conventions"]["patterns"].items()
+}
+_NAMING_RULES = {
+    element_type: re.compile(rule["pattern"])
+    for element_type, rule in CODE_QUALITY_CHECKS["naming_conventions"]["rules"].items()
+}
+_COMMON_ISSUE_PATTERNS = {
+    issue_name: _compile_scan_pattern(issue_config["pattern"])
+    for issue_name, issue_config in CODE_QUALITY_CHECKS["common_issues"]["patterns"].items()
+}
+
+# Patterns for function extraction
+_PY_FUNCTION_RE = _compile_scan_pattern(r'def\s+([a-zA-Z0-9_]+)\s*\((.*?)\):')
+# Each JS pattern captures the function name in group 1 and its parameters in group 2
+_JS_FUNCTION_RES = [
+    _compile_scan_pattern(r'function\s+([a-zA-Z0-9_]+)\s*\((.*?)\)'),
+    _compile_scan_pattern(r'(?:const|let|var)\s+([a-zA-Z0-9_]+)\s*=\s*function\s*\((.*?)\)'),
+    _compile_scan_pattern(r'(?:const|let|var)\s+([a-zA-Z0-9_]+)\s*=\s*\((.*?)\)\s*=>')
+]
+
+# Patterns for Cursor rule files
+_RULE_DESCRIPTION_RE = re.compile(r'# (.+)')
+_RULE_FILE_PATTERNS_RE = re.compile(r'```cursor-filepath-patterns\s+(.*?)\s+```', re.DOTALL)
+_REGEX_METACHARACTERS = frozenset('.^$*+?{}[]|()')
+
+def parse_cursor_rule(content, rule_path):
+    """Parse the description and file patterns out of a Cursor rule file.
+    
+    Only this derived data is kept (and cached); the rule text is read again
+    from rule_path if the report needs it.
+    """
+    # Extract rule description and patterns
+    description_match = _RULE_DESCRIPTION_RE.search(content)
+    description = description_match.group(1) if description_match else "No description"
+    
+    # Extract file patterns
+    file_patterns = []
+    pattern_matches = _RULE_FILE_PATTERNS_RE.findall(content)
+    if pattern_matches:
+        file_patterns = [p.strip() for p in pattern_matches[0].split('\n') if p.strip()]
+    
+    return {
+        "description": description,
+        "file_patterns": file_patterns,
+        "path": rule_path
+    }
+
+def load_rules_cache():
+    """Load previously parsed rules keyed by file name, or an empty cache."""
+    try:
+        with open(RULES_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_rules_cache(cache):
+    """Write parsed rules back to the cache file."""
+    try:
+        os.makedirs(os.path.dirname(RULES_CACHE_FILE), exist_ok=True)
+        with open(RULES_CACHE_FILE, 'w') as f:
+            json.dump(cache, f, separators=(',', ':'))
+    except OSError as e:
+        print(f"Error writing rules cache: {e}")
+
 def load_cursor_rules():
-    """Load Cursor rules from the rules directory."""
+    """Load Cursor rules from the rules directory, reusing cached parses of unchanged files."""
     rules = {}
     
     if not os.path.exists(CURSOR_RULES_DIR):
         print(f"Cursor rules directory not found: {CURSOR_RULES_DIR}")
         return rules
     
-    for filename in os.listdir(CURSOR_RULES_DIR):
-        if filename.endswith('.mdc'):
-            rule_path = os.path.join(CURSOR_RULES_DIR, filename)
-            rule_name = os.path.splitext(filename)[0]
+    cache = load_rules_cache()
+    fresh_cache = {}
+    
+    with os.scandir(CURSOR_RULES_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.mdc'):
+                continue
+            
+            rule_name = entry.name[:-4]
             
             try:
-                with open(rule_path, 'r') as f:
-                    content = f.read()
+                if not entry.is_file():
+                    continue
                 
-                # Extract rule description and patterns
-                description_match = re.search(r'# (.+)', content)
-                description = description_match.group(1) if description_match else "No description"
+                stat = entry.stat()
                 
-                # Extract file patterns
-                file_patterns = []
-                pattern_matches = re.findall(r'```cursor-filepath-patterns\s+(.*?)\s+```', content, re.DOTALL)
-                if pattern_matches:
-                    file_patterns = [p.strip() for p in pattern_matches[0].split('\n') if p.strip()]
+                # A rule file is re-read only when its mtime or size has changed
+                cached = cache.get(entry.name)
+                if cached and cached.get("mtime_ns") == stat.st_mtime_ns and cached.get("size") == stat.st_size:
+                    rule = cached["rule"]
+                else:
+                    with open(entry.path, 'r') as f:
+                        rule = parse_cursor_rule(f.read(), entry.path)
                 
-                rules[rule_name] = {
-                    "description": description,
-                    "file_patterns": file_patterns,
-                    "content": content
-                }
+                rules[rule_name] = rule
+                fresh_cache[entry.name] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "rule": rule}
             
             except Exception as e:
                 print(f"Error loading rule {rule_name}: {e}")
     
+    # Rewriting also drops entries for rule files that were deleted
+    if fresh_cache != cache:
+        save_rules_cache(fresh_cache)
+    
     return rules
 
+def iter_changed_paths(base_ref, head_ref):
+    """Yield paths changed between two refs as git diff streams them."""
+    process = subprocess.Popen(
+        ['git', 'diff', '--name-only', '-z', '--diff-filter=ACMR', base_ref, head_ref],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    
+    with process:
+        pending = b''
+        for chunk in iter(lambda: process.stdout.read(65536), b''):
+            *paths, pending = (pending + chunk).split(b'\0')
+            for path in paths:
+                if path:
+                    yield path.decode('utf-8', 'surrogateescape')
+        
+        if pending:
+            yield pending.decode('utf-8', 'surrogateescape')
+    
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, process.args)
+
+def iter_reviewable_paths(base_ref, head_ref):
+    """Yield changed paths that exist in the working tree and are worth reviewing.
+    
+    Files under vendored directories and files over MAX_FILE_SIZE are left
+    out. File contents are not read here; use read_changed_file so that only
+    one file needs to be held in memory at a time.
+    """
+    for file_path in iter_changed_paths(base_ref, head_ref):
+        if VENDORED_DIRS.intersection(file_path.split('/')[:-1]):
+            print(f"Skipping vendored file {file_path}")
+            continue
+        
+        try:
+            size = os.stat(file_path).st_size
+        except OSError:
+            # Not present in the working tree
+            continue
+        
+        if size > MAX_FILE_SIZE:
+            print(f"Skipping {file_path}: larger than {MAX_FILE_SIZE} bytes")
+            continue
+        
+        yield file_path
+
 def get_changed_files(base_ref, head_ref):
     """Get list of files changed between two refs with their content."""
     try:
-        # Get list of changed files
-        result = subprocess.run(
-            ['git', 'diff', '--name-only', base_ref, head_ref],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        files = [f.strip() for f in result.stdout.strip().split('\n') if f.strip()]
-        
-        # Get content of each file
         files_with_content = {}
-        for file_path in files:
-            if os.path.exists(file_path):
-                try:
-                    with open(file_path, 'r') as f:
-                        content = f.read()
-                    files_with_content[file_path] = content
-                except Exception as e:
-                    print(f"Error reading file {file_path}: {e}")
+        for file_path in iter_reviewable_paths(base_ref, head_ref):
+            content = read_changed_file(file_path)
+            if content is not None:
+                files_with_content[file_path] = content
         
         return files_with_content
     
@@ -139,19 +281,141 @@ def get_changed_files(base_ref, head_ref):
         print(f"Error getting changed files: {e}")
         return {}
 
-def match_file_to_rules(file_path, cursor_rules):
-    """Match a file to applicable Cursor rules based on file patterns."""
-    applicable_rules = []
+def read_changed_file(file_path):
+    """Read a changed file's content, or return None if it is binary or cannot be read."""
+    try:
+        with open(file_path, 'rb') as f:
+            # A NUL byte near the start marks a binary file, as git itself assumes
+            head = f.read(BINARY_SNIFF_BYTES)
+            if b'\0' in head:
+                print(f"Skipping binary file {file_path}")
+                return None
+            data = head + f.read()
+        
+        # Decode leniently and normalize newlines as text-mode reads did
+        content = data.decode('utf-8', 'replace')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+    except Exception as e:
+        print(f"Error reading file {file_path}: {e}")
+        return None
+
+def literal_regex_text(pattern):
+    """Return the text a regex matches literally, or None if it uses any regex syntax."""
+    chars = []
+    escaped = False
+    
+    for char in pattern:
+        if escaped:
+            # Escaped letters and digits are classes or backreferences, not literals
+            if char.isalnum():
+                return None
+            chars.append(char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char in _REGEX_METACHARACTERS:
+            return None
+        else:
+            chars.append(char)
+    
+    return None if escaped else ''.join(chars)
+
+def build_rule_index(cursor_rules):
+    """Compile every rule's file patterns once, returning (rule_name, matcher) pairs."""
+    rule_index = []
     
     for rule_name, rule in cursor_rules.items():
+        exact, prefixes, suffixes, substrings, regexes = set(), [], [], [], []
+        
         for pattern in rule["file_patterns"]:
-            if re.search(pattern, file_path):
-                applicable_rules.append(rule_name)
-                break
-    
-    return applicable_rules
+            try:
+                compiled = re.compile(pattern)
+            except re.error as e:
+                print(f"Invalid file pattern {pattern!r} in rule {rule_name}: {e}")
+                continue
+            
+            # Most rule patterns are literal paths anchored with ^ and/or $ (e.g. \.py$),
+            # which plain string checks answer without running the regex engine
+            anchored_start = pattern.startswith('^')
+            body = pattern[1:] if anchored_start else pattern
+            anchored_end = body.endswith('$')
+            literal = literal_regex_text(body[:-1] if anchored_end else body)
+            
+            if literal is None:
+                regexes.append(compiled)
+            elif anchored_start and anchored_end:
+                exact.add(literal)
+            elif anchored_start:
+                prefixes.append(literal)
+            elif anchored_end:
+                suffixes.append(literal)
+            else:
+                substrings.append(literal)
+        
+        rule_index.append((rule_name, {
+            "exact": exact,
+            "prefixes": tuple(prefixes),
+            "suffixes": tuple(suffixes),
+            "substrings": substrings,
+            "regexes": regexes
+        }))
+    
+    return rule_index
+
+def rule_matches_file(file_path, matcher):
+    """Check whether any of a rule's file patterns matches a path."""
+    return (
+        file_path in matcher["exact"]
+        or file_path.startswith(matcher["prefixes"])
+        or file_path.endswith(matcher["suffixes"])
+        or any(literal in file_path for literal in matcher["substrings"])
+        or any(pattern.search(file_path) for pattern in matcher["regexes"])
+    )
+
+def match_file_to_rules(file_path, cursor_rules):
+    """Match a file to applicable Cursor rules based on file patterns."""
+    return match_file_to_rule_index(file_path, build_rule_index(cursor_rules))
+
+def match_file_to_rule_index(file_path, rule_index):
+    """Match a file to applicable Cursor rules using an index from build_rule_index."""
+    return [rule_name for rule_name, matcher in rule_index if rule_matches_file(file_path, matcher)]
 
-def check_naming_conventions(file_path, content):
+def build_line_index(content):
+    """Return the offsets of every newline in content, for offset-to-line lookups."""
+    line_index = []
+    pos = content.find('\n')
+    while pos != -1:
+        line_index.append(pos)
+        pos = content.find('\n', pos + 1)
+    return line_index
+
+def offset_to_line(line_index, offset):
+    """Convert a character offset into a 1-based line number."""
+    return bisect.bisect_left(line_index, offset) + 1
+
+def iter_lines_from(content, source_lines, line_index, offset):
+    """Iterate the lines of content from an offset onwards, reusing the already split lines.
+    
+    Yields the same lines as splitting content[offset:] on newlines, without
+    copying the rest of the file.
+    """
+    line = offset_to_line(line_index, offset)
+    line_end = line_index[line - 1] if line <= len(line_index) else len(content)
+    return itertools.chain((content[offset:line_end],), itertools.islice(source_lines, line, None))
+
+def oversized_content_issue(file_path, check_name):
+    """Build the issue reported instead of running a pattern scan on oversized content."""
+    return {
+        "file": file_path,
+        "line": 1,
+        "issue_type": "file_size",
+        "message": f"File too large for {check_name} scan (> {MAX_SCAN_CHARS} characters)",
+        "severity": "low"
+    }
+
+def check_naming_conventions(file_path, content, line_index=None):
     """Check naming conventions in the file content."""
     issues = []
     
@@ -168,81 +432,132 @@ def check_naming_conventions(file_path, content):
     if not file_type:
         return issues
     
+    if len(content) > MAX_SCAN_CHARS:
+        return [oversized_content_issue(file_path, "naming convention")]
+    
     # Get patterns for the file type
-    patterns = CODE_QUALITY_CHECKS["naming_conventions"]["patterns"].get(file_type, {})
+    patterns = _NAMING_PATTERNS.get(file_type, {})
     rules = CODE_QUALITY_CHECKS["naming_conventions"]["rules"]
     
+    if line_index is None:
+        line_index = build_line_index(content)
+    
+    # The same name flagged twice on one line is reported once
+    seen = set()
+    
     # Check each naming convention
     for element_type, pattern in patterns.items():
-        matches = re.findall(pattern, content)
+        rule = rules.get(element_type)
+        if not rule:
+            continue
         
-        # Handle tuple matches (e.g., from regex groups)
-        if matches and isinstance(matches[0], tuple):
-            matches = [m for match in matches for m in match if m]
+        is_valid_name = _NAMING_RULES[element_type].match
+        message = rule["message"]
         
-        for match in matches:
-            rule = rules.get(element_type)
-            if rule and not re.match(rule["pattern"], match):
+        # Check every non-empty captured group, located by its own offset
+        groups = range(1, pattern.groups + 1) if pattern.groups else (0,)
+        for found in pattern.finditer(content):
+            for group in groups:
+                match = found.group(group)
+                if not match or is_valid_name(match):
+                    continue
+                
+                line = offset_to_line(line_index, found.start(group))
+                key = (line, element_type, match)
+                if key in seen:
+                    continue
+                seen.add(key)
+                
                 issues.append({
                     "file": file_path,
-                    "line": find_line_number(content, match),
+                    "line": line,
                     "issue_type": "naming_convention",
                     "element_type": element_type,
                     "name": match,
-                    "message": rule["message"],
+                    "message": message,
                     "severity": "medium"
                 })
     
     return issues
 
-def check_code_complexity(file_path, content):
+def check_code_complexity(file_path, content, line_index=None):
     """Check code complexity issues in the file content."""
     issues = []
     
+    # Look up the limits and build their messages once per file
+    checks = CODE_QUALITY_CHECKS["code_complexity"]["checks"]
+    max_lines = checks["function_length"]["max_lines"]
+    length_message = checks["function_length"]["message"].format(max_lines=max_lines)
+    max_params = checks["parameter_count"]["max_params"]
+    params_message = checks["parameter_count"]["message"].format(max_params=max_params)
+    
     # Check function length
-    functions = extract_functions(file_path, content)
+    functions = extract_functions(file_path, content, line_index)
     for func in functions:
         # Check function length
-        if len(func["lines"]) > CODE_QUALITY_CHECKS["code_complexity"]["checks"]["function_length"]["max_lines"]:
+        if len(func["lines"]) > max_lines:
             issues.append({
                 "file": file_path,
                 "line": func["start_line"],
                 "issue_type": "code_complexity",
                 "complexity_type": "function_length",
                 "function": func["name"],
-                "message": CODE_QUALITY_CHECKS["code_complexity"]["checks"]["function_length"]["message"].format(
-                    max_lines=CODE_QUALITY_CHECKS["code_complexity"]["checks"]["function_length"]["max_lines"]
-                ),
+                "message": length_message,
                 "severity": "medium"
             })
         
         # Check parameter count
-        if len(func["parameters"]) > CODE_QUALITY_CHECKS["code_complexity"]["checks"]["parameter_count"]["max_params"]:
+        if len(func["parameters"]) > max_params:
             issues.append({
                 "file": file_path,
                 "line": func["start_line"],
                 "issue_type": "code_complexity",
                 "complexity_type": "parameter_count",
                 "function": func["name"],
-                "message": CODE_QUALITY_CHECKS["code_complexity"]["checks"]["parameter_count"]["message"].format(
-                    max_params=CODE_QUALITY_CHECKS["code_complexity"]["checks"]["parameter_count"]["max_params"]
-                ),
+                "message": params_message,
                 "severity": "medium"
             })
     
     return issues
 
-def check_common_issues(file_path, content):
+def check_common_issues(file_path, content, line_index=None):
     """Check for common coding issues in the file content."""
     issues = []
     
+    if len(content) > MAX_SCAN_CHARS:
+        return [oversized_content_issue(file_path, "common issue")]
+    
+    if line_index is None:
+        line_index = build_line_index(content)
+    
     for issue_name, issue_config in CODE_QUALITY_CHECKS["common_issues"]["patterns"].items():
-        matches = re.finditer(issue_config["pattern"], content)
+        matches = _COMMON_ISSUE_PATTERNS[issue_name].finditer(content)
         
+        # The same text matched twice on one line is reported once
+        seen = set()
         for match in matches:
+            line = offset_to_line(line_index, match.start())
+            key = (line, match.group(0))
+            if key in seen:
+                continue
+            
+            if len(seen) == MAX_MATCHES_PER_PATTERN:
+                # Record one note for the rest instead of an issue per match
+                issues.append({
+                    "file": file_path,
+                    "line": line,
+                    "issue_type": "common_issue",
+                    "issue_name": issue_name,
+                    "message": f"{issue_config['message']} (truncated after {MAX_MATCHES_PER_PATTERN} matches)",
+                    "severity": issue_config["severity"],
+                    "truncated": True
+                })
+                break
+            
+            seen.add(key)
             issues.append({
                 "file": file_path,
-                "line": find_line_number(content, match.group(0)),
+                "line": line,
                 "issue_type": "common_issue",
                 "issue_name": issue_name,
                 "match": match.group(0),
@@ -252,7 +567,46 @@ def check_common_issues(file_path, content):
     
     return issues
 
-def extract_functions(file_path, content):
+def extract_python_functions(content):
+    """Extract Python functions by parsing the source; raises SyntaxError if it does not parse.
+    
+    Deeply nested sources can also raise RecursionError or MemoryError from the parser.
+    """
+    # Split on "\n" only, so indexes line up with ast line numbers; splitlines()
+    # would also break on form feeds and other separators
+    source_lines = content.split('\n')
+    functions = []
+    
+    # Compiler warnings about the reviewed code (e.g. invalid escapes) are not ours to print
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        tree = ast.parse(content)
+    
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        
+        # Count every parameter the way it is written in the signature
+        args = node.args
+        params = [a.arg for a in args.posonlyargs + args.args]
+        if args.vararg:
+            params.append(f"*{args.vararg.arg}")
+        params.extend(a.arg for a in args.kwonlyargs)
+        if args.kwarg:
+            params.append(f"**{args.kwarg.arg}")
+        
+        functions.append({
+            "name": node.name,
+            "parameters": params,
+            "start_line": node.lineno,
+            "lines": source_lines[node.lineno - 1:node.end_lineno]
+        })
+    
+    # ast.walk is breadth-first; report functions in source order
+    functions.sort(key=lambda func: func["start_line"])
+    return functions
+
+def extract_functions(file_path, content, line_index=None):
     """Extract functions from file content with their details."""
     functions = []
     
@@ -260,10 +614,23 @@ def extract_functions(file_path, content):
     _, ext = os.path.splitext(file_path)
     ext = ext.lower()
     
+    if ext not in ('.py', '.js', '.ts'):
+        return functions
+    
+    if line_index is None:
+        line_index = build_line_index(content)
+    
     if ext == '.py':
-        # Python function extraction
-        function_pattern = r'def\s+([a-zA-Z0-9_]+)\s*\((.*?)\):'
-        matches = re.finditer(function_pattern, content)
+        try:
+            return extract_python_functions(content)
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            # Fall back to pattern matching for files that do not parse, or that
+            # nest too deeply for the parser (e.g. very long expression chains)
+            pass
+        
+        # Python function extraction; split the content once for every match
+        source_lines = content.split('\n')
+        matches = _PY_FUNCTION_RE.finditer(content)
         
         for match in matches:
             func_name = match.group(1)
@@ -272,21 +639,21 @@ def extract_functions(file_path, content):
             
             # Find function body
             start_pos = match.end()
-            start_line = content[:start_pos].count('\n') + 1
+            start_line = offset_to_line(line_index, start_pos)
             
             # Extract function lines (simplified approach)
-            lines = content[start_pos:].split('\n')
+            lines = iter_lines_from(content, source_lines, line_index, start_pos)
             func_lines = []
             
             # Find indentation level of first line
-            for i, line in enumerate(lines):
+            for line in lines:
                 if line.strip():
                     base_indent = len(line) - len(line.lstrip())
                     func_lines.append(line)
                     break
             
             # Continue until we find a line with same or less indentation
-            for line in lines[i+1:]:
+            for line in lines:
                 if line.strip() and (len(line) - len(line.lstrip())) <= base_indent:
                     break
                 func_lines.append(line)
@@ -299,32 +666,21 @@ def extract_functions(file_path, content):
             })
     
     elif ext in ['.js', '.ts']:
-        # JavaScript/TypeScript function extraction
-        function_patterns = [
-            r'function\s+([a-zA-Z0-9_]+)\s*\((.*?)\)',
-            r'(const|let|var)\s+([a-zA-Z0-9_]+)\s*=\s*function\s*\((.*?)\)',
-            r'(const|let|var)\s+([a-zA-Z0-9_]+)\s*=\s*\((.*?)\)\s*=>'
-        ]
-        
-        for pattern in function_patterns:
-            matches = re.finditer(pattern, content)
+        # JavaScript/TypeScript function extraction; split the content once for every match
+        source_lines = content.split('\n')
+        for pattern in _JS_FUNCTION_RES:
+            matches = pattern.finditer(content)
             
             for match in matches:
-                if pattern == function_patterns[0]:
-                    func_name = match.group(1)
-                    params_str = match.group(2)
-                else:
-                    func_name = match.group(2)
-                    params_str = match.group(3)
-                
+                func_name, params_str = match.group(1, 2)
                 params = [p.strip() for p in params_str.split(',') if p.strip()]
                 
                 # Find function body (simplified)
                 start_pos = match.end()
-                start_line = content[:start_pos].count('\n') + 1
+                start_line = offset_to_line(line_index, start_pos)
                 
                 # Extract function lines (very simplified)
-                lines = content[start_pos:].split('\n')
+                lines = iter_lines_from(content, source_lines, line_index, start_pos)
                 func_lines = []
                 
                 # Find opening brace
@@ -351,104 +707,135 @@ def extract_functions(file_path, content):
     
     return functions
 
-def find_line_number(content, substring):
-    """Find the line number of a substring in the content."""
-    lines = content.split('\n')
-    for i, line in enumerate(lines):
-        if substring in line:
-            return i + 1
-    return 1  # Default to first line if not found
+def analyze_file(file_path):
+    """Read one changed file and run every code quality check on it.
+    
+    Returns the list of issues, or None if the file could not be read. This is
+    a top-level function so it can run in a worker process.
+    """
+    content = read_changed_file(file_path)
+    if content is None:
+        return None
+    
+    # Share one line index across the checks
+    line_index = build_line_index(content)
+    return (
+        check_naming_conventions(file_path, content, line_index)
+        + check_code_complexity(file_path, content, line_index)
+        + check_common_issues(file_path, content, line_index)
+    )
+
+def read_rule_points(rule_path, limit):
+    """Return a rule's "- " bullet points, stopping at limit + 1 so callers can tell if more exist."""
+    points = []
+    
+    # The file is read line by line, so long rules are only read up to the last point needed
+    with open(rule_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('- '):
+                points.append(line[2:])
+                if len(points) > limit:
+                    break
+    
+    return points
 
 def generate_pr_review_report(issues, applicable_rules):
     """Generate a PR review report based on issues found."""
     if not issues and not applicable_rules:
         return "No issues found in the pull request."
     
-    report = "# Automated PR Review Report\n\n"
+    parts = ["# Automated PR Review Report\n\n"]
+    
+    # Bucket the issues in one pass, noting the names seen for the recommendations
+    severity_counts = defaultdict(int)
+    by_type = defaultdict(list)
+    issue_names = set()
+    for issue in issues:
+        # A truncation note stands in for the skipped matches; it is not an issue itself
+        if not issue.get("truncated"):
+            severity_counts[issue["severity"]] += 1
+        by_type[issue["issue_type"]].append(issue)
+        if "issue_name" in issue:
+            issue_names.add(issue["issue_name"])
     
     # Summarize issues by severity
     if issues:
-        by_severity = defaultdict(list)
-        for issue in issues:
-            by_severity[issue["severity"]].append(issue)
-        
-        report += "## Issues Summary\n\n"
+        parts.append("## Issues Summary\n\n")
         
         for severity in ["critical", "high", "medium", "low"]:
-            if severity in by_severity:
-                count = len(by_severity[severity])
-                report += f"- **{severity.upper()}**: {count} issue{'s' if count > 1 else ''}\n"
+            if severity in severity_counts:
+                count = severity_counts[severity]
+                parts.append(f"- **{severity.upper()}**: {count} issue{'s' if count > 1 else ''}\n")
         
-        report += "\n"
+        parts.append("\n")
         
         # Detail issues by type
-        report += "## Detailed Issues\n\n"
-        
-        by_type = defaultdict(list)
-        for issue in issues:
-            issue_type = issue["issue_type"]
-            by_type[issue_type].append(issue)
+        parts.append("## Detailed Issues\n\n")
         
         for issue_type, type_issues in by_type.items():
-            report += f"### {issue_type.replace('_', ' ').title()}\n\n"
+            parts.append(f"### {issue_type.replace('_', ' ').title()}\n\n")
             
             for issue in type_issues:
-                report += f"- **{issue['file']}** (line {issue['line']}): {issue['message']}\n"
+                parts.append(f"- **{issue['file']}** (line {issue['line']}): {issue['message']}\n")
                 
                 if "name" in issue:
-                    report += f"  - Name: `{issue['name']}`\n"
+                    parts.append(f"  - Name: `{issue['name']}`\n")
                 
                 if "match" in issue:
-                    report += f"  - Found: `{issue['match']}`\n"
+                    parts.append(f"  - Found: `{issue['match']}`\n")
                 
                 if "function" in issue:
-                    report += f"  - Function: `{issue['function']}`\n"
+                    parts.append(f"  - Function: `{issue['function']}`\n")
                 
-                report += f"  - Severity: {issue['severity']}\n"
-                report += "\n"
+                parts.append(f"  - Severity: {issue['severity']}\n")
+                parts.append("\n")
     
     # Add applicable rules
     if applicable_rules:
-        report += "## Applicable Cursor Rules\n\n"
+        parts.append("## Applicable Cursor Rules\n\n")
         
         for rule_name, rule_details in applicable_rules.items():
-            report += f"### {rule_name}\n\n"
-            report += f"{rule_details['description']}\n\n"
+            parts.append(f"### {rule_name}\n\n")
+            parts.append(f"{rule_details['description']}\n\n")
             
-            # Extract key points from rule content
-            content = rule_details["content"]
-            points = re.findall(r'- (.+)', content)
+            # Extract key points from the rule file
+            try:
+                points = read_rule_points(rule_details["path"], 5)  # Limit to first 5 points
+            except OSError as e:
+                print(f"Error reading rule {rule_name}: {e}")
+                points = []
             
             if points:
-                report += "Key points:\n\n"
-                for point in points[:5]:  # Limit to first 5 points
-                    report += f"- {point}\n"
+                parts.append("Key points:\n\n")
+                for point in points[:5]:
+                    parts.append(f"- {point}\n")
                 
                 if len(points) > 5:
-                    report += f"- *(and {len(points) - 5} more...)*\n"
+                    parts.append("- *(and more...)*\n")
                 
-                report += "\n"
+                parts.append("\n")
     
     # Add recommendations
     if issues:
-        report += "## Recommendations\n\n"
+        parts.append("## Recommendations\n\n")
         
-        if any(i["severity"] in ["critical", "high"] for i in issues):
-            report += "- **Address high severity issues before merging**\n"
+        if "critical" in severity_counts or "high" in severity_counts:
+            parts.append("- **Address high severity issues before merging**\n")
         
-        if any(i["issue_type"] == "naming_convention" for i in issues):
-            report += "- **Review naming conventions** to ensure consistency\n"
+        if "naming_convention" in by_type:
+            parts.append("- **Review naming conventions** to ensure consistency\n")
         
-        if any(i["issue_type"] == "code_complexity" for i in issues):
-            report += "- **Consider refactoring complex functions** to improve maintainability\n"
+        if "code_complexity" in by_type:
+            parts.append("- **Consider refactoring complex functions** to improve maintainability\n")
         
-        if any(i["issue_name"] == "debug_code" for i in issues if "issue_name" in i):
-            report += "- **Remove debug code** before merging\n"
+        if "debug_code" in issue_names:
+            parts.append("- **Remove debug code** before merging\n")
         
-        if any(i["issue_name"] == "hardcoded_secrets" for i in issues if "issue_name" in i):
-            report += "- **Remove hardcoded secrets** and use environment variables or secure storage\n"
+        if "hardcoded_secrets" in issue_names:
+            parts.append("- **Remove hardcoded secrets** and use environment variables or secure storage\n")
     
-    return report
+    return "".join(parts)
 
 def main():
     parser = argparse.ArgumentParser(description='Enhance GitHub PR review with automated checks')
@@ -461,33 +848,41 @@ def main():
     print("Loading Cursor rules...")
     cursor_rules = load_cursor_rules()
     print(f"Loaded {len(cursor_rules)} Cursor rules")
+    rule_index = build_rule_index(cursor_rules)
     
     # Get changed files
     print(f"Getting files changed between {args.base_ref} and {args.head_ref}")
-    files_with_content = get_changed_files(args.base_ref, args.head_ref)
+    try:
+        changed_files = list(iter_reviewable_paths(args.base_ref, args.head_ref))
+    except subprocess.CalledProcessError as e:
+        print(f"Error getting changed files: {e}")
+        changed_files = []
     
-    if not files_with_content:
+    if not changed_files:
         print("No changed files found")
         return 0
     
-    print(f"Found {len(files_with_content)} changed files")
+    print(f"Found {len(changed_files)} changed files")
     
     # Analyze files
     all_issues = []
     applicable_rule_details = {}
     
-    for file_path, content in files_with_content.items():
-        print(f"Analyzing {file_path}...")
-        
-        # Match file to applicable rules
-        applicable_rules = match_file_to_rules(file_path, cursor_rules)
-        for rule_name in applicable_rules:
-            applicable_rule_details[rule_name] = cursor_rules[rule_name]
-        
-        # Run code quality checks
-        all_issues.extend(check_naming_conventions(file_path, content))
-        all_issues.extend(check_code_complexity(file_path, content))
-        all_issues.extend(check_common_issues(file_path, content))
+    # Files are independent, so check them in parallel; map keeps file order
+    max_workers = min(len(changed_files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for file_path, issues in zip(changed_files, executor.map(analyze_file, changed_files, chunksize=8)):
+            if issues is None:
+                continue
+            
+            print(f"Analyzing {file_path}...")
+            
+            # Match file to applicable rules
+            applicable_rules = match_file_to_rule_index(file_path, rule_index)
+            for rule_name in applicable_rules:
+                applicable_rule_details[rule_name] = cursor_rules[rule_name]
+            
+            all_issues.extend(issues)
     
     # Generate report
     report = generate_pr_review_report(all_issues, applicable_rule_details)
@@ -10,7 +10,9 @@ It categorizes changes by type and includes links to relevant PRs and issues.
 import re
 import sys
 import argparse
+import functools
 import subprocess
+from collections import defaultdict
 from datetime import datetime
 
 # Configuration
@@ -32,38 +34,49 @@ CONVENTIONAL_COMMIT_PATTERN = r'^(feat|fix|docs|style|refactor|perf|test|build|c
 PR_PATTERN = r'#(\d+)'
 ISSUE_PATTERN = r'(#[A-Z]+-[A-Z0-9]+-[ST][0-9]+|#[A-Z]+-[0-9]+)'
 
+# Compiled once at import time
+_CONVENTIONAL_COMMIT_RE = re.compile(CONVENTIONAL_COMMIT_PATTERN)
+_PR_RE = re.compile(PR_PATTERN)
+_ISSUE_RE = re.compile(ISSUE_PATTERN)
+_BREAKING_CHANGE_RE = re.compile(r'BREAKING CHANGE:(.*?)(?=\n\n|\Z)', re.DOTALL)
+
+def parse_commit_record(record):
+    """Split one raw git log record into a commit dict."""
+    commit_hash, subject, body = record.decode('utf-8', 'replace').split('\x1f', 2)
+    return {
+        'hash': commit_hash,
+        'subject': subject,
+        'body': body.rstrip('\n')
+    }
+
+def iter_commits(from_ref, to_ref):
+    """Yield commits between two refs as git log streams them."""
+    # -z separates commits with NUL and fields are separated by US (0x1f), so
+    # subjects and multi-line bodies are never split apart
+    process = subprocess.Popen(
+        ['git', 'log', '-z', '--pretty=format:%H%x1f%s%x1f%b', f'{from_ref}..{to_ref}'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    
+    with process:
+        pending = b''
+        for chunk in iter(lambda: process.stdout.read(65536), b''):
+            *records, pending = (pending + chunk).split(b'\0')
+            for record in records:
+                yield parse_commit_record(record)
+        
+        # NUL is a separator, not a terminator, so the last commit is still pending
+        if pending:
+            yield parse_commit_record(pending)
+    
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, process.args)
+
 def get_commits(from_ref, to_ref):
     """Get commits between two refs in conventional commit format."""
     try:
-        result = subprocess.run(
-            ['git', 'log', '--pretty=format:%H|%s|%b', f'{from_ref}..{to_ref}'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        commits = []
-        for line in result.stdout.strip().split('\n'):
-            if not line:
-                continue
-            
-            parts = line.split('|', 2)
-            if len(parts) >= 3:
-                commit_hash, subject, body = parts
-                commits.append({
-                    'hash': commit_hash,
-                    'subject': subject,
-                    'body': body
-                })
-            elif len(parts) == 2:
-                commit_hash, subject = parts
-                commits.append({
-                    'hash': commit_hash,
-                    'subject': subject,
-                    'body': ''
-                })
-        
-        return commits
+        return list(iter_commits(from_ref, to_ref))
     
     except subprocess.CalledProcessError as e:
         print(f"Error getting commits: {e}")
@@ -71,7 +84,26 @@ def get_commits(from_ref, to_ref):
 
 def parse_conventional_commit(commit):
     """Parse a commit message according to Conventional Commits format."""
-    match = re.match(CONVENTIONAL_COMMIT_PATTERN, commit['subject'])
+    parsed = _parse_commit_message(commit['subject'], commit['body'])
+    if not parsed:
+        return None
+    
+    type_name, scope, description, pr_numbers, issues = parsed
+    
+    return {
+        'hash': commit['hash'],
+        'type': type_name,
+        'scope': scope,
+        'description': description,
+        'pr_numbers': list(pr_numbers),
+        'issues': list(issues),
+        'body': commit['body']
+    }
+
+@functools.lru_cache(maxsize=4096)
+def _parse_commit_message(subject, body):
+    """Parse a subject and body; cached because cherry-picks and reverts repeat messages."""
+    match = _CONVENTIONAL_COMMIT_RE.match(subject)
     if not match:
         return None
     
@@ -82,58 +114,78 @@ def parse_conventional_commit(commit):
         scope = scope[1:-1]  # Remove ( and )
     
     # Extract PR numbers
-    pr_numbers = []
-    pr_matches = re.findall(PR_PATTERN, commit['body'])
-    if pr_matches:
-        pr_numbers = [int(pr) for pr in pr_matches]
+    pr_numbers = tuple(int(pr) for pr in _PR_RE.findall(body))
     
     # Extract issue references
-    issues = []
-    issue_matches = re.findall(ISSUE_PATTERN, commit['body'])
-    if issue_matches:
-        issues = issue_matches
+    issues = tuple(_ISSUE_RE.findall(body))
     
-    return {
-        'hash': commit['hash'],
-        'type': type_name,
-        'scope': scope,
-        'description': description,
-        'pr_numbers': pr_numbers,
-        'issues': issues,
-        'body': commit['body']
-    }
+    return type_name, scope, description, pr_numbers, issues
 
-def categorize_commits(commits):
-    """Categorize commits by type and scope."""
-    categorized = {}
+def categorize_and_collect_breaking(commits):
+    """Categorize commits by type and scope, collecting breaking changes in the same pass."""
+    categorized = defaultdict(lambda: defaultdict(list))
+    breaking_changes = []
     
     for commit in commits:
         parsed = parse_conventional_commit(commit)
         if not parsed:
             continue
         
-        type_name = parsed['type']
-        scope = parsed['scope'] or 'general'
-        
-        if type_name not in categorized:
-            categorized[type_name] = {}
+        categorized[parsed['type']][parsed['scope'] or 'general'].append(parsed)
         
-        if scope not in categorized[type_name]:
-            categorized[type_name][scope] = []
-        
-        categorized[type_name][scope].append(parsed)
+        breaking_change = extract_breaking_change(parsed)
+        if breaking_change:
+            breaking_changes.append(breaking_change)
     
+    return categorized, breaking_changes
+
+def categorize_commits(commits):
+    """Categorize commits by type and scope."""
+    categorized, _ = categorize_and_collect_breaking(commits)
     return categorized
 
-def generate_release_notes(categorized_commits, version, date=None):
-    """Generate formatted release notes from categorized commits."""
+def extract_breaking_change(commit):
+    """Return the breaking change note for a parsed commit, or None."""
+    if "BREAKING CHANGE:" not in commit['body']:
+        return None
+    
+    breaking_change = _BREAKING_CHANGE_RE.search(commit['body'])
+    if not breaking_change:
+        return None
+    
+    return {
+        'description': breaking_change.group(1).strip(),
+        'commit': commit
+    }
+
+def find_breaking_changes(categorized_commits):
+    """Collect breaking change notes from already categorized commits."""
+    breaking_changes = []
+    for scopes in categorized_commits.values():
+        for commits in scopes.values():
+            for commit in commits:
+                breaking_change = extract_breaking_change(commit)
+                if breaking_change:
+                    breaking_changes.append(breaking_change)
+    
+    return breaking_changes
+
+def generate_release_notes(categorized_commits, version, date=None, breaking_changes=None):
+    """Generate formatted release notes from categorized commits.
+    
+    Pass breaking_changes from categorize_and_collect_breaking to skip a
+    second walk over the commits.
+    """
     if not date:
         date = datetime.now().strftime('%Y-%m-%d')
     
-    notes = f"# Release {version} ({date})\n\n"
+    if breaking_changes is None:
+        breaking_changes = find_breaking_changes(categorized_commits)
+    
+    parts = [f"# Release {version} ({date})\n\n"]
     
     # Add summary
-    notes += "## Summary\n\n"
+    parts.append("## Summary\n\n")
     
     for type_name, scopes in categorized_commits.items():
         if type_name not in COMMIT_TYPES:
@@ -143,9 +195,9 @@ def generate_release_notes(categorized_commits, version, date=None):
         count = sum(len(commits) for commits in scopes.values())
         
         if count > 0:
-            notes += f"- **{type_display}**: {count}\n"
+            parts.append(f"- **{type_display}**: {count}\n")
     
-    notes += "\n"
+    parts.append("\n")
     
     # Add details by type
     for type_name, scopes in sorted(categorized_commits.items()):
@@ -154,68 +206,50 @@ def generate_release_notes(categorized_commits, version, date=None):
         
         type_display = COMMIT_TYPES[type_name]
         
-        notes += f"## {type_display}\n\n"
+        parts.append(f"## {type_display}\n\n")
         
         for scope, commits in sorted(scopes.items()):
             if scope != 'general':
-                notes += f"### {scope.capitalize()}\n\n"
+                parts.append(f"### {scope.capitalize()}\n\n")
             
             for commit in commits:
                 # Format the commit entry
-                entry = f"- {commit['description']}"
+                parts.append(f"- {commit['description']}")
                 
                 # Add PR references
                 if commit['pr_numbers']:
                     prs = ', '.join([f"[#{pr}](https://github.com/your-org/your-repo/pull/{pr})" for pr in commit['pr_numbers']])
-                    entry += f" ({prs})"
+                    parts.append(f" ({prs})")
                 
                 # Add issue references
                 if commit['issues']:
                     issues = ', '.join([f"[{issue}](https://github.com/your-org/your-repo/issues/{issue.replace('#', '')})" for issue in commit['issues']])
-                    entry += f" - {issues}"
+                    parts.append(f" - {issues}")
                 
                 # Add commit hash
                 short_hash = commit['hash'][:7]
-                entry += f" ([{short_hash}](https://github.com/your-org/your-repo/commit/{commit['hash']}))"
-                
-                notes += f"{entry}\n"
+                parts.append(f" ([{short_hash}](https://github.com/your-org/your-repo/commit/{commit['hash']}))\n")
             
-            notes += "\n"
+            parts.append("\n")
     
     # Add breaking changes section if any
-    breaking_changes = []
-    for type_name, scopes in categorized_commits.items():
-        for scope, commits in scopes.items():
-            for commit in commits:
-                if "BREAKING CHANGE:" in commit['body']:
-                    breaking_change = re.search(r'BREAKING CHANGE:(.*?)(?=\n\n|\Z)', commit['body'], re.DOTALL)
-                    if breaking_change:
-                        breaking_changes.append({
-                            'description': breaking_change.group(1).strip(),
-                            'commit': commit
-                        })
-    
     if breaking_changes:
-        notes += "## BREAKING CHANGES\n\n"
+        parts.append("## BREAKING CHANGES\n\n")
         
         for change in breaking_changes:
             commit = change['commit']
-            entry = f"- **{commit['type']}**"
-            
-            if commit['scope']:
-                entry += f"({commit['scope']})"
-            
-            entry += f": {change['description']}"
+            scope = f"({commit['scope']})" if commit['scope'] else ""
             
             # Add commit hash
             short_hash = commit['hash'][:7]
-            entry += f" ([{short_hash}](https://github.com/your-org/your-repo/commit/{commit['hash']}))"
-            
-            notes += f"{entry}\n"
+            parts.append(
+                f"- **{commit['type']}**{scope}: {change['description']}"
+                f" ([{short_hash}](https://github.com/your-org/your-repo/commit/{commit['hash']}))\n"
+            )
         
-        notes += "\n"
+        parts.append("\n")
     
-    return notes
+    return "".join(parts)
 
 def main():
     parser = argparse.ArgumentParser(description='Generate release notes from Conventional Commits')
@@ -237,10 +271,10 @@ def main():
     print(f"Found {len(commits)} commits")
     
     # Categorize commits
-    categorized = categorize_commits(commits)
+    categorized, breaking_changes = categorize_and_collect_breaking(commits)
     
     # Generate release notes
-    release_notes = generate_release_notes(categorized, args.version, args.date)
+    release_notes = generate_release_notes(categorized, args.version, args.date, breaking_changes=breaking_changes)
     
     # Output release notes
     if args.output:
@@ -13,7 +13,10 @@ import re
 import sys
 import json
 import argparse
+import functools
+import itertools
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # Configuration
@@ -21,10 +24,32 @@ ROADMAP_DIR = os.path.expanduser("~/project/roadmap")
 EPICS_DIR = os.path.expanduser("~/project/work_items/epics")
 TEMPLATES_DIR = os.path.expanduser("~/project/templates")
 
-# Ensure directories exist
-os.makedirs(ROADMAP_DIR, exist_ok=True)
-os.makedirs(EPICS_DIR, exist_ok=True)
-os.makedirs(TEMPLATES_DIR, exist_ok=True)
+# Roadmap item sections and the fields they are parsed into
+ROADMAP_SECTIONS = {
+    "Description": "description",
+    "Business Value": "business_value",
+    "Strategic Alignment": "strategic_alignment",
+    "Features/Capabilities": "features",
+    "Timeframe": "timeframe"
+}
+
+# Success metrics used when a roadmap item does not state any
+DEFAULT_SUCCESS_METRICS = "\n".join([
+    "- Successful implementation of all planned features",
+    "- User adoption rate meets or exceeds expectations",
+    "- No critical bugs reported after release"
+])
+
+# First and last day ("MM-DD") of each quarter; they are the same every year
+QUARTER_RANGES = {
+    "1": ("01-01", "03-31"),
+    "2": ("04-01", "06-30"),
+    "3": ("07-01", "09-30"),
+    "4": ("10-01", "12-31")
+}
+
+# Roadmap items converted concurrently in batch mode
+MAX_WORKERS = 16
 
 # Epic template
 EPIC_TEMPLATE = """# Epic: {title}
@@ -54,120 +79,181 @@ EPIC_TEMPLATE = """# Epic: {title}
 {roadmap_reference}
 """
 
-def list_roadmap_items():
-    """List all roadmap items in the roadmap directory."""
-    if not os.path.exists(ROADMAP_DIR):
-        print(f"Roadmap directory {ROADMAP_DIR} does not exist")
-        return []
+def render_epic(title, business_value, strategic_alignment, success_metrics, scope_summary, roadmap_reference):
+    """Render EPIC_TEMPLATE for one Epic."""
+    return EPIC_TEMPLATE.format(
+        title=title,
+        business_value=business_value,
+        strategic_alignment=strategic_alignment,
+        success_metrics=success_metrics,
+        scope_summary=scope_summary,
+        roadmap_reference=roadmap_reference
+    )
+
+# Parsed roadmap items keyed by (file path, mtime), shared by listing and Epic creation
+_parse_cache = {}
+
+# Patterns compiled once at import time instead of on every call
+_TITLE_RE = re.compile(r'# (.+)')
+_QUARTER_RE = re.compile(r'Q([1-4])\s+(\d{4})')
+_MONTHS_RE = re.compile(r'Next\s+(\d+)\s+months', re.IGNORECASE)
+_METRIC_RE = re.compile(r'(increase|decrease|improve|reduce|enhance|optimize|achieve)\s+([^,.]+)', re.IGNORECASE)
+# Bullets may be indented (nested), but a dash inside a line is not a bullet
+_BULLET_RE = re.compile(r'^[ \t]*- (.+)$', re.MULTILINE)
+
+def parse_roadmap_content(content):
+    """Extract the key information from a roadmap item's markdown."""
+    # Extract title
+    title_match = _TITLE_RE.search(content)
+    item_data = {"title": title_match.group(1) if title_match else "Unknown"}
+    item_data.update(dict.fromkeys(ROADMAP_SECTIONS.values(), ""))
+    
+    # Extract every wanted section in one pass; a section runs until the next
+    # line starting with "##", subsections included, and the first one wins
+    found = set()
+    for chunk in ('\n' + content).split('\n##')[1:]:
+        heading, _, body = chunk.partition('\n')
+        field = ROADMAP_SECTIONS.get(heading.strip())
+        if field and field not in found:
+            found.add(field)
+            item_data[field] = body.strip()
+    
+    return item_data
+
+def read_roadmap_item(file_path):
+    """Read and parse a roadmap item, reusing the earlier parse while the file is unchanged."""
+    key = (file_path, os.stat(file_path).st_mtime_ns)
+    item_data = _parse_cache.get(key)
     
-    roadmap_files = [f for f in os.listdir(ROADMAP_DIR) if f.endswith('.md')]
-    roadmap_items = []
+    if item_data is None:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            item_data = _parse_cache[key] = parse_roadmap_content(f.read())
     
-    for filename in roadmap_files:
-        file_path = os.path.join(ROADMAP_DIR, filename)
-        item_id = os.path.splitext(filename)[0]
-        
-        try:
-            with open(file_path, 'r') as f:
-                content = f.read()
+    return item_data
+
+def read_roadmap_metadata(file_path):
+    """Read only as much of a roadmap item as needed to find its title and timeframe."""
+    title = None
+    timeframe_lines = None
+    in_timeframe = False
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if title is None:
+                title_match = _TITLE_RE.search(line)
+                if title_match:
+                    title = title_match.group(1)
             
-            # Extract title
-            title_match = re.search(r'# (.+)', content)
-            title = title_match.group(1) if title_match else "Unknown"
+            # Sections are delimited the same way as in parse_roadmap_content
+            if line.startswith('##'):
+                if in_timeframe:
+                    in_timeframe = False
+                elif timeframe_lines is None and line[2:].strip() == "Timeframe":
+                    timeframe_lines = []
+                    in_timeframe = True
+            elif in_timeframe:
+                timeframe_lines.append(line)
             
-            # Extract quarter/timeframe
-            timeframe_match = re.search(r'## Timeframe\s+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-            timeframe = timeframe_match.group(1).strip() if timeframe_match else "Unknown"
+            if title is not None and timeframe_lines is not None and not in_timeframe:
+                break
+    
+    return {
+        "title": title or "Unknown",
+        "timeframe": "".join(timeframe_lines or []).strip()
+    }
+
+def make_roadmap_item(item_id, file_path, item_data):
+    """Build the listing entry for a roadmap item."""
+    return {
+        "id": item_id,
+        "title": item_data["title"],
+        "timeframe": item_data["timeframe"] or "Unknown",
+        "file_path": file_path
+    }
+
+def iter_roadmap_items(metadata_only=False):
+    """Yield roadmap items as the directory is scanned.
+    
+    With metadata_only, files are read only up to their title and timeframe;
+    otherwise they are fully parsed and cached for creating Epics later.
+    """
+    try:
+        entries = os.scandir(ROADMAP_DIR)
+    except FileNotFoundError:
+        print(f"Roadmap directory {ROADMAP_DIR} does not exist")
+        return
+    
+    with entries:
+        for entry in entries:
+            if not entry.name.endswith('.md'):
+                continue
             
-            roadmap_items.append({
-                "id": item_id,
-                "title": title,
-                "timeframe": timeframe,
-                "file_path": file_path
-            })
-        
-        except Exception as e:
-            print(f"Error reading roadmap item {filename}: {e}")
+            try:
+                if not entry.is_file():
+                    continue
+                
+                if metadata_only:
+                    item_data = read_roadmap_metadata(entry.path)
+                else:
+                    item_data = read_roadmap_item(entry.path)
+                
+                yield make_roadmap_item(entry.name[:-3], entry.path, item_data)
+            
+            except Exception as e:
+                print(f"Error reading roadmap item {entry.name}: {e}")
+
+def load_roadmap_item(item_id):
+    """Load one roadmap item by ID without scanning the directory, or None if it does not exist."""
+    # IDs are file names, so an ID with a path separator cannot name an item
+    if not item_id or os.path.basename(item_id) != item_id:
+        return None
+    
+    file_path = os.path.join(ROADMAP_DIR, f"{item_id}.md")
+    try:
+        return make_roadmap_item(item_id, file_path, read_roadmap_item(file_path))
+    
+    except (FileNotFoundError, IsADirectoryError):
+        return None
     
-    return roadmap_items
+    except Exception as e:
+        print(f"Error reading roadmap item {item_id}.md: {e}")
+        return None
 
-def parse_roadmap_item(file_path):
+def list_roadmap_items(metadata_only=False):
+    """List all roadmap items in the roadmap directory."""
+    return list(iter_roadmap_items(metadata_only=metadata_only))
+
+def parse_roadmap_item(file_path, log=print):
     """Parse a roadmap item file to extract key information."""
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
-        # Extract title
-        title_match = re.search(r'# (.+)', content)
-        title = title_match.group(1) if title_match else "Unknown"
-        
-        # Extract description
-        description_match = re.search(r'## Description\s+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        description = description_match.group(1).strip() if description_match else ""
-        
-        # Extract business value
-        value_match = re.search(r'## Business Value\s+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        business_value = value_match.group(1).strip() if value_match else ""
-        
-        # Extract strategic alignment
-        alignment_match = re.search(r'## Strategic Alignment\s+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        strategic_alignment = alignment_match.group(1).strip() if alignment_match else ""
-        
-        # Extract features/capabilities
-        features_match = re.search(r'## Features/Capabilities\s+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        features = features_match.group(1).strip() if features_match else ""
-        
-        # Extract timeframe
-        timeframe_match = re.search(r'## Timeframe\s+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        timeframe = timeframe_match.group(1).strip() if timeframe_match else ""
-        
-        return {
-            "title": title,
-            "description": description,
-            "business_value": business_value,
-            "strategic_alignment": strategic_alignment,
-            "features": features,
-            "timeframe": timeframe
-        }
+        return read_roadmap_item(file_path)
     
     except Exception as e:
-        print(f"Error parsing roadmap item: {e}")
+        log(f"Error parsing roadmap item: {e}")
         return None
 
-def generate_epic_id(roadmap_id):
+def generate_epic_id(roadmap_id, now=None):
     """Generate an Epic ID based on the roadmap item ID."""
     # Add a timestamp to ensure uniqueness
-    timestamp = datetime.now().strftime("%m%d%H%M")
+    timestamp = (now or datetime.now()).strftime("%m%d%H%M")
     return f"{roadmap_id}-E{timestamp}"
 
-def estimate_timeline(timeframe):
+def estimate_timeline(timeframe, now=None):
     """Estimate a timeline based on the roadmap timeframe."""
-    current_date = datetime.now()
-    
+    # Each pattern needs a literal that a plain substring check can rule out,
+    # so empty and "Unknown" timeframes never reach the regex engine.
     # Parse quarter information (e.g., "Q2 2023")
-    quarter_match = re.search(r'Q([1-4])\s+(\d{4})', timeframe)
+    quarter_match = _QUARTER_RE.search(timeframe) if 'Q' in timeframe else None
     if quarter_match:
-        quarter = int(quarter_match.group(1))
+        start, end = QUARTER_RANGES[quarter_match.group(1)]
         year = int(quarter_match.group(2))
         
-        # Calculate start and end dates for the quarter
-        start_month = (quarter - 1) * 3 + 1
-        end_month = quarter * 3
-        
-        start_date = datetime(year, start_month, 1)
-        if end_month == 12:
-            end_date = datetime(year, end_month, 31)
-        else:
-            end_date = datetime(year, end_month + 1, 1) - timedelta(days=1)
-        
-        # Format dates
-        start_str = start_date.strftime("%Y-%m-%d")
-        end_str = end_date.strftime("%Y-%m-%d")
-        
-        return f"{start_str} to {end_str}"
+        return f"{year}-{start} to {year}-{end}"
+    
+    current_date = now or datetime.now()
     
     # Check for "Next X months" pattern
-    months_match = re.search(r'Next\s+(\d+)\s+months', timeframe, re.IGNORECASE)
+    months_match = _MONTHS_RE.search(timeframe) if 'month' in timeframe.lower() else None
     if months_match:
         months = int(months_match.group(1))
         end_date = current_date + timedelta(days=30 * months)
@@ -184,52 +270,52 @@ def estimate_timeline(timeframe):
     
     return f"{start_str} to {end_str} (estimated)"
 
+# Roadmap items written from the same template often repeat these sections
+# word for word, so both extractors are memoized
+@functools.lru_cache(maxsize=256)
 def extract_success_metrics(business_value, description):
     """Extract or generate success metrics based on business value and description."""
-    # Look for metrics in the business value
-    metrics_matches = re.findall(r'(increase|decrease|improve|reduce|enhance|optimize|achieve)\s+([^,.]+)', 
-                               business_value + " " + description, re.IGNORECASE)
-    
-    metrics = []
-    for action, target in metrics_matches:
-        metrics.append(f"- {action.capitalize()} {target}")
-    
-    # If no metrics found, generate generic ones
-    if not metrics:
-        metrics = [
-            "- Successful implementation of all planned features",
-            "- User adoption rate meets or exceeds expectations",
-            "- No critical bugs reported after release"
-        ]
-    
-    return "\n".join(metrics)
+    # Look for metrics in the business value, then the description; scanning
+    # each on its own avoids copying them into one string
+    metrics = [
+        f"- {match.group(1).capitalize()} {match.group(2)}"
+        for text in (business_value, description)
+        for match in _METRIC_RE.finditer(text)
+    ]
+    
+    # If no metrics found, use the generic ones
+    return "\n".join(metrics) if metrics else DEFAULT_SUCCESS_METRICS
 
+@functools.lru_cache(maxsize=256)
 def extract_scope_items(features):
     """Extract scope items from features/capabilities section."""
-    # Look for bullet points
-    items = re.findall(r'- (.+)', features)
-    
-    # If no bullet points, split by newlines
-    if not items:
-        items = [line.strip() for line in features.split('\n') if line.strip()]
+    # Look for bullet points; if there are none, split by newlines
+    items = _BULLET_RE.findall(features) or [line.strip() for line in features.splitlines() if line.strip()]
     
     # Format as bullet points
-    scope_items = []
-    for item in items:
-        scope_items.append(f"- {item}")
-    
-    return "\n".join(scope_items)
+    return "\n".join(f"- {item}" for item in items)
+
+def write_file_bytes(file_path, data):
+    """Write bytes to a file with raw os.write calls, skipping the text file object layers."""
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        # os.write may write fewer bytes than asked, so continue until all are written
+        remaining = memoryview(data)
+        while remaining:
+            remaining = remaining[os.write(fd, remaining):]
+    finally:
+        os.close(fd)
 
-def create_epic_from_roadmap(roadmap_item):
-    """Create an Epic from a roadmap item."""
+def create_epic_from_roadmap(roadmap_item, log=print, now=None):
+    """Create an Epic from a roadmap item, reporting progress through log."""
     # Parse roadmap item
-    item_data = parse_roadmap_item(roadmap_item["file_path"])
+    item_data = parse_roadmap_item(roadmap_item["file_path"], log)
     if not item_data:
-        print(f"Failed to parse roadmap item {roadmap_item['id']}")
+        log(f"Failed to parse roadmap item {roadmap_item['id']}")
         return None
     
     # Generate Epic ID
-    epic_id = generate_epic_id(roadmap_item["id"])
+    epic_id = generate_epic_id(roadmap_item["id"], now)
     
     # Extract success metrics
     success_metrics = extract_success_metrics(item_data["business_value"], item_data["description"])
@@ -238,7 +324,7 @@ def create_epic_from_roadmap(roadmap_item):
     scope_summary = extract_scope_items(item_data["features"])
     
     # Create Epic content
-    epic_content = EPIC_TEMPLATE.format(
+    epic_content = render_epic(
         title=item_data["title"],
         business_value=item_data["business_value"],
         strategic_alignment=item_data["strategic_alignment"],
@@ -250,27 +336,33 @@ def create_epic_from_roadmap(roadmap_item):
     # Save Epic file
     epic_file_path = os.path.join(EPICS_DIR, f"{epic_id}.md")
     try:
-        with open(epic_file_path, 'w') as f:
-            f.write(epic_content)
+        write_file_bytes(epic_file_path, epic_content.encode('utf-8'))
         
-        print(f"Created Epic {epic_id} from Roadmap Item {roadmap_item['id']}")
+        log(f"Created Epic {epic_id} from Roadmap Item {roadmap_item['id']}")
         return {
             "id": epic_id,
             "title": item_data["title"],
-            "file_path": epic_file_path
+            "file_path": epic_file_path,
+            "content": epic_content
         }
     
     except Exception as e:
-        print(f"Error creating Epic file: {e}")
+        log(f"Error creating Epic file: {e}")
         return None
 
+def process_roadmap_item(roadmap_item, now=None):
+    """Create an Epic for batch mode, returning it with the messages it logged."""
+    messages = []
+    epic = create_epic_from_roadmap(roadmap_item, messages.append, now)
+    return epic, messages
+
 def interactive_mode():
     """Run the tool in interactive mode, guiding the user through the process."""
     print("Roadmap to Epic Transition Tool")
     print("===============================\n")
     
-    # List roadmap items
-    roadmap_items = list_roadmap_items()
+    # List roadmap items; only the selected one is converted, so just read titles and timeframes
+    roadmap_items = list_roadmap_items(metadata_only=True)
     if not roadmap_items:
         print("No roadmap items found. Please create roadmap items first.")
         return 1
@@ -324,13 +416,10 @@ def interactive_mode():
     # Ask if user wants to view the created Epic
     view = input("\nView created Epic? (y/n): ")
     if view.lower() == 'y':
-        try:
-            with open(epic['file_path'], 'r') as f:
-                print("\n" + "=" * 80 + "\n")
-                print(f.read())
-                print("\n" + "=" * 80)
-        except Exception as e:
-            print(f"Error reading Epic file: {e}")
+        # The Epic is still in memory, so there is no need to read the file back
+        print("\n" + "=" * 80 + "\n")
+        print(epic['content'])
+        print("\n" + "=" * 80)
     
     return 0
 
@@ -339,41 +428,53 @@ def batch_mode(roadmap_ids=None):
     print("Roadmap to Epic Transition Tool (Batch Mode)")
     print("===========================================\n")
     
-    # List roadmap items
-    roadmap_items = list_roadmap_items()
-    if not roadmap_items:
-        print("No roadmap items found. Please create roadmap items first.")
-        return 1
-    
-    # Filter by IDs if specified
+    # List roadmap items, opening only the requested files if IDs are specified
     if roadmap_ids:
-        filtered_items = [item for item in roadmap_items if item['id'] in roadmap_ids]
-        if not filtered_items:
+        roadmap_items = [item for item in map(load_roadmap_item, dict.fromkeys(roadmap_ids)) if item]
+        if not roadmap_items:
             print(f"No roadmap items found with IDs: {', '.join(roadmap_ids)}")
             return 1
-        roadmap_items = filtered_items
+    else:
+        roadmap_items = list_roadmap_items()
+        if not roadmap_items:
+            print("No roadmap items found. Please create roadmap items first.")
+            return 1
     
     print(f"Processing {len(roadmap_items)} roadmap items...")
     
-    # Process each roadmap item
+    # Every Epic in the batch is stamped with the same time
+    now = datetime.now()
+    
+    # Process the roadmap items concurrently; each item's messages are printed
+    # together, in order, once its Epic has been written
     created_epics = []
-    for item in roadmap_items:
-        print(f"\nProcessing: {item['title']} [{item['id']}]")
-        epic = create_epic_from_roadmap(item)
-        if epic:
-            created_epics.append(epic)
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(roadmap_items))) as executor:
+        results = executor.map(process_roadmap_item, roadmap_items, itertools.repeat(now))
+        for item, (epic, messages) in zip(roadmap_items, results):
+            # One write per item instead of one print per line
+            lines = [f"\nProcessing: {item['title']} [{item['id']}]", *messages]
+            sys.stdout.write("\n".join(lines) + "\n")
+            
+            if epic:
+                created_epics.append(epic)
     
     # Summarize results
     print("\nBatch Processing Complete")
     print(f"Created {len(created_epics)} Epics from {len(roadmap_items)} Roadmap Items")
     
     if created_epics:
-        print("\nCreated Epics:")
-        for epic in created_epics:
-            print(f"- {epic['id']}: {epic['title']}")
+        lines = ["\nCreated Epics:"]
+        lines.extend(f"- {epic['id']}: {epic['title']}" for epic in created_epics)
+        sys.stdout.write("\n".join(lines) + "\n")
     
     return 0
 
+def ensure_directories():
+    """Create the roadmap, Epic and template directories if they don't exist."""
+    os.makedirs(ROADMAP_DIR, exist_ok=True)
+    os.makedirs(EPICS_DIR, exist_ok=True)
+    os.makedirs(TEMPLATES_DIR, exist_ok=True)
+
 def main():
     parser = argparse.ArgumentParser(description='Transition Roadmap items to Epics')
     parser.add_argument('--batch', action='store_true', help='Run in batch mode')
@@ -381,8 +482,7 @@ def main():
     args = parser.parse_args()
     
     # Create directories if they don't exist
-    os.makedirs(ROADMAP_DIR, exist_ok=True)
-    os.makedirs(EPICS_DIR, exist_ok=True)
+    ensure_directories()
     
     # Run in appropriate mode
     if args.batch: